@@ -1,15 +1,18 @@
 """
 Agri-Nexus Configuration Module
 ================================
-Centralized configuration management using Pydantic Settings.
+Centralized configuration management loaded from environment variables.
 """
 
-from pydantic_settings import BaseSettings
+from dataclasses import dataclass, fields
+from dotenv import dotenv_values
 from functools import lru_cache
-from typing import Optional
+from typing import Any, Optional
+import os
 
 
-class Settings(BaseSettings):
+@dataclass(frozen=True, slots=True)
+class Settings:
     """Application settings loaded from environment variables."""
     
     # API Settings
@@ -34,6 +37,11 @@ class Settings(BaseSettings):
     TWILIO_AUTH_TOKEN: Optional[str] = None
     TWILIO_PHONE_NUMBER: Optional[str] = None
     
+    # Elevation Data (directory of SRTM .hgt tiles; regional estimate if unset)
+    SRTM_DATA_DIR: Optional[str] = None
+    # OpenTopoData-style elevation API, e.g. https://api.opentopodata.org/v1/srtm90m
+    ELEVATION_API_URL: Optional[str] = None
+    
     # Simulation Settings
     SIMULATION_TICK_INTERVAL: float = 2.0  # seconds
     SIMULATION_PERSIST_INTERVAL: int = 60  # ticks (virtual hours)
@@ -43,10 +51,38 @@ class Settings(BaseSettings):
     STORM_WARNING_THRESHOLD: float = 990.0  # hPa pressure
     HEAT_WARNING_THRESHOLD: float = 38.0  # °C
     FROST_WARNING_THRESHOLD: float = 2.0  # °C
+
+
+_TRUE_VALUES = {"1", "true", "yes", "on", "y", "t"}
+
+
+def _parse(field_type: Any, raw: str) -> Any:
+    """Convert a raw environment string to the field's declared type."""
+    if field_type is bool:
+        return raw.strip().lower() in _TRUE_VALUES
+    if field_type is int:
+        return int(raw)
+    if field_type is float:
+        return float(raw)
+    return raw
+
+
+def _load() -> Settings:
+    """
+    Build Settings from a single pass over the environment.
+    
+    Values from a local .env file are used as defaults; real environment
+    variables take precedence. Names are case-sensitive.
+    """
+    env = {key: value for key, value in dotenv_values(".env").items() if value is not None}
+    env.update(os.environ)
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    overrides = {
+        field.name: _parse(field.type, env[field.name])
+        for field in fields(Settings)
+        if field.name in env
+    }
+    return Settings(**overrides)
 
 
 @lru_cache()
@@ -55,7 +91,7 @@ def get_settings() -> Settings:
     Get cached settings instance.
     Uses LRU cache to avoid re-reading .env on every call.
     """
-    return Settings()
+    return _load()
 
 
 # Export settings instance
@@ -5,32 +5,60 @@ Catches and formats all errors consistently.
 """
 
 from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
 import logging
+import orjson
 
 logger = logging.getLogger("agri-nexus.errors")
 
+# Pre-encoded error bodies. Only the status code and message of HTTP errors
+# vary, so they are spliced into a fixed byte template instead of building
+# and JSON-encoding a new dict per error.
+_HTTP_ERROR_TEMPLATE = b'{"error":true,"status_code":%d,"message":%s,"type":"http_error"}'
+_INTERNAL_ERROR_BODY = orjson.dumps({
+    "error": True,
+    "status_code": 500,
+    "message": "Sensor Malfunction - Internal server error",
+    "type": "internal_error"
+})
+
+
+def _encode_detail(detail) -> bytes:
+    """
+    JSON-encode an HTTPException detail.
+    
+    orjson covers the usual str/dict/list details; anything it can't encode
+    (sets, Decimals, custom objects) goes through jsonable_encoder, and as a
+    last resort is sent as its string form, so the handler never fails.
+    """
+    try:
+        return orjson.dumps(detail)
+    except orjson.JSONEncodeError:
+        pass
+    try:
+        return orjson.dumps(jsonable_encoder(detail))
+    except (orjson.JSONEncodeError, TypeError, ValueError):
+        return orjson.dumps(str(detail))
+
 
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions with consistent JSON format."""
-    logger.warning(f"HTTP {exc.status_code}: {exc.detail} - {request.url}")
-    return JSONResponse(
+    logger.warning("HTTP %s: %s - %s", exc.status_code, exc.detail, request.url)
+    return Response(
+        content=_HTTP_ERROR_TEMPLATE % (exc.status_code, _encode_detail(exc.detail)),
         status_code=exc.status_code,
-        content={
-            "error": True,
-            "status_code": exc.status_code,
-            "message": exc.detail,
-            "type": "http_error"
-        }
+        media_type="application/json",
+        headers=getattr(exc, "headers", None)
     )
 
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle Pydantic validation errors."""
     errors = exc.errors()
-    logger.warning(f"Validation error: {errors} - {request.url}")
+    logger.warning("Validation error: %s - %s", errors, request.url)
     
     # Format errors for frontend
     formatted_errors = []
@@ -55,17 +83,13 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions."""
-    logger.error(f"Unexpected error: {exc} - {request.url}", exc_info=True)
+    logger.error("Unexpected error: %s - %s", exc, request.url, exc_info=True)
     
     # Don't expose internal error details in production
-    return JSONResponse(
+    return Response(
+        content=_INTERNAL_ERROR_BODY,
         status_code=500,
-        content={
-            "error": True,
-            "status_code": 500,
-            "message": "Sensor Malfunction - Internal server error",
-            "type": "internal_error"
-        }
+        media_type="application/json"
     )
 
 
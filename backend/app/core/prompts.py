@@ -4,6 +4,9 @@ AI Prompt Engineering Module
 System prompts for the Deep Research Agent and AI Agronomist.
 """
 
+import string
+from typing import Any, Dict, Optional, Tuple
+
 # ============================================
 # Main Agronomist System Prompt
 # ============================================
@@ -248,6 +251,41 @@ Format the response as a professional report with clear sections, bullet points,
 """
 
 
+# ============================================
+# Template Rendering
+# ============================================
+# Each template is parsed once at import into (literal, field, spec, conversion)
+# chunks, so rendering is a single pass over a short tuple instead of
+# re-scanning the full template text for placeholders on every call.
+ParsedTemplate = Tuple[Tuple[str, Optional[str], Optional[str], Optional[str]], ...]
+
+_CONVERTERS = {"r": repr, "s": str, "a": ascii}
+
+
+def _compile(template: str) -> ParsedTemplate:
+    """Parse a template into literal chunks and field names."""
+    return tuple(string.Formatter().parse(template))
+
+
+def _render(parsed: ParsedTemplate, kwargs: Dict[str, Any]) -> str:
+    """Render a parsed template; equivalent to ``template.format(**kwargs)``."""
+    parts = []
+    for literal, field, spec, conversion in parsed:
+        parts.append(literal)
+        if field is not None:
+            value = kwargs[field]
+            if conversion:
+                value = _CONVERTERS[conversion](value)
+            parts.append(format(value, spec) if spec else str(value))
+    return "".join(parts)
+
+
+_CROP_RECOMMENDATION_PARSED = _compile(CROP_RECOMMENDATION_PROMPT)
+_RISK_ASSESSMENT_PARSED = _compile(RISK_ASSESSMENT_PROMPT)
+_WEATHER_ANALYSIS_PARSED = _compile(WEATHER_ANALYSIS_PROMPT)
+_FULL_RESEARCH_PARSED = _compile(FULL_RESEARCH_PROMPT)
+
+
 def get_agronomist_prompt() -> str:
     """Get the base agronomist system prompt."""
     return AGRONOMIST_SYSTEM_PROMPT
@@ -255,19 +293,19 @@ def get_agronomist_prompt() -> str:
 
 def get_crop_recommendation_prompt(**kwargs) -> str:
     """Get formatted crop recommendation prompt."""
-    return CROP_RECOMMENDATION_PROMPT.format(**kwargs)
+    return _render(_CROP_RECOMMENDATION_PARSED, kwargs)
 
 
 def get_risk_assessment_prompt(**kwargs) -> str:
     """Get formatted risk assessment prompt."""
-    return RISK_ASSESSMENT_PROMPT.format(**kwargs)
+    return _render(_RISK_ASSESSMENT_PARSED, kwargs)
 
 
 def get_weather_analysis_prompt(**kwargs) -> str:
     """Get formatted weather analysis prompt."""
-    return WEATHER_ANALYSIS_PROMPT.format(**kwargs)
+    return _render(_WEATHER_ANALYSIS_PARSED, kwargs)
 
 
 def get_full_research_prompt(**kwargs) -> str:
     """Get formatted full research prompt."""
-    return FULL_RESEARCH_PROMPT.format(**kwargs)
+    return _render(_FULL_RESEARCH_PARSED, kwargs)
@@ -0,0 +1,25 @@
+"""
+JSON Response Class
+===================
+orjson-backed default response class for the API.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+import orjson
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse that renders with orjson instead of the stdlib json module.
+    
+    Defined locally because FastAPI's bundled ORJSONResponse is deprecated
+    in newer releases. orjson handles datetimes and numpy arrays natively.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
@@ -5,13 +5,40 @@ Handles multiple WebSocket connections for real-time sensor streaming.
 """
 
 from fastapi import WebSocket
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Union
 import asyncio
-import json
 import logging
+import orjson
 
 logger = logging.getLogger("agri-nexus.websocket")
 
+# A message is either a JSON-serializable dict or an already encoded frame
+Message = Union[dict, str, bytes]
+
+# Minimum spacing between coalesced frames sent to one farm (seconds)
+FLUSH_INTERVAL = 0.1
+
+# Longest a single send may block before the client is dropped as too slow
+# (seconds). Without it one stalled socket holds up every farm's flush.
+SEND_TIMEOUT = 5.0
+# Longest to wait for the close frame when dropping a stalled client (seconds)
+CLOSE_TIMEOUT = 1.0
+
+
+def encode_message(message: Message) -> str:
+    """
+    Encode a message as a JSON text frame.
+    
+    Uses orjson (C implementation) instead of the stdlib json encoder that
+    send_json relies on. Frames are sent as text because the frontend
+    parses event.data directly with JSON.parse.
+    """
+    if isinstance(message, str):
+        return message
+    if isinstance(message, bytes):
+        return message.decode()
+    return orjson.dumps(message).decode()
+
 
 class ConnectionManager:
     """
@@ -22,6 +49,10 @@ class ConnectionManager:
     - Connections are organized by farm_id
     - Automatic cleanup on disconnect
     - Broadcast to all clients or specific farms
+    
+    The bookkeeping dicts/sets are only touched from the event loop and
+    never across an await point, so each mutation runs to completion
+    without interleaving and no lock is needed.
     """
     
     def __init__(self):
@@ -29,8 +60,12 @@ class ConnectionManager:
         self.active_connections: Dict[str, Set[WebSocket]] = {}
         # All connections regardless of farm
         self.all_connections: Set[WebSocket] = set()
-        # Lock for thread-safe operations
-        self._lock = asyncio.Lock()
+        # Reverse index of connection -> farm_id, so any failed send can be
+        # pruned without the caller knowing the farm
+        self._ws_to_farm: Dict[WebSocket, str] = {}
+        # Latest not-yet-sent frame per farm for coalesced updates
+        self._pending: Dict[str, str] = {}
+        self._flush_task: Optional[asyncio.Task] = None
     
     async def connect(self, websocket: WebSocket, farm_id: str):
         """
@@ -42,81 +77,141 @@ class ConnectionManager:
         """
         await websocket.accept()
         
-        async with self._lock:
-            # Add to farm-specific list
-            if farm_id not in self.active_connections:
-                self.active_connections[farm_id] = set()
-            self.active_connections[farm_id].add(websocket)
-            
-            # Add to global list
-            self.all_connections.add(websocket)
+        # Add to farm-specific list
+        self.active_connections.setdefault(farm_id, set()).add(websocket)
         
-        logger.info(f"Client connected to farm {farm_id}. Total connections: {len(self.all_connections)}")
+        # Add to global list
+        self.all_connections.add(websocket)
+        self._ws_to_farm[websocket] = farm_id
+        
+        logger.info("Client connected to farm %s. Total connections: %d", farm_id, len(self.all_connections))
     
-    async def disconnect(self, websocket: WebSocket, farm_id: str):
+    async def disconnect(self, websocket: WebSocket, farm_id: Optional[str] = None):
         """
         Remove a WebSocket connection.
         
         Args:
             websocket: The WebSocket connection
-            farm_id: The farm this connection was subscribed to
+            farm_id: The farm this connection was subscribed to (looked up
+                from the connection if omitted)
         """
-        async with self._lock:
-            # Remove from farm-specific list
-            if farm_id in self.active_connections:
-                self.active_connections[farm_id].discard(websocket)
-                # Clean up empty sets
-                if not self.active_connections[farm_id]:
-                    del self.active_connections[farm_id]
-            
-            # Remove from global list
-            self.all_connections.discard(websocket)
-        
-        logger.info(f"Client disconnected from farm {farm_id}. Total connections: {len(self.all_connections)}")
+        farm_id = self._ws_to_farm.pop(websocket, farm_id)
+        
+        # Remove from farm-specific list
+        connections = self.active_connections.get(farm_id)
+        if connections is not None:
+            connections.discard(websocket)
+            # Clean up empty sets
+            if not connections:
+                self.active_connections.pop(farm_id, None)
+        
+        # Remove from global list
+        self.all_connections.discard(websocket)
+        
+        logger.info("Client disconnected from farm %s. Total connections: %d", farm_id, len(self.all_connections))
     
-    async def send_personal_message(self, message: dict, websocket: WebSocket):
-        """Send a message to a specific WebSocket connection."""
+    async def send_personal_message(self, message: Message, websocket: WebSocket):
+        """Send a message (dict or pre-encoded JSON) to a specific connection."""
         try:
-            await websocket.send_json(message)
+            await websocket.send_text(encode_message(message))
         except Exception as e:
-            logger.error(f"Error sending message: {e}")
+            logger.error("Error sending message: %s", e)
     
-    async def broadcast_to_farm(self, message: dict, farm_id: str):
+    async def broadcast_to_farm(self, message: Message, farm_id: str):
         """
         Broadcast a message to all clients subscribed to a specific farm.
         
+        The message is serialized once and the same frame is sent to every
+        subscriber.
+        
         Args:
-            message: JSON-serializable message to send
+            message: JSON-serializable message (or pre-encoded JSON) to send
             farm_id: The farm to broadcast to
         """
         if farm_id not in self.active_connections:
             return
         
-        disconnected = set()
+        await self._send_farm(farm_id, encode_message(message))
+    
+    def publish_to_farm(self, message: Message, farm_id: str):
+        """
+        Queue a state update for a farm, coalescing rapid updates.
         
-        for connection in self.active_connections[farm_id]:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting to client: {e}")
-                disconnected.add(connection)
+        Only the latest message per farm is kept and a background flusher
+        sends it at most once every FLUSH_INTERVAL seconds, so bursts of
+        simulator ticks (e.g. rain/drought commands) collapse into a single
+        frame. Use broadcast_to_farm for messages that must all be delivered.
+        
+        Args:
+            message: JSON-serializable message (or pre-encoded JSON) to send
+            farm_id: The farm to publish to
+        """
+        if farm_id not in self.active_connections:
+            return
+        
+        self._pending[farm_id] = encode_message(message)
+        
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flusher())
+    
+    async def _flusher(self):
+        """Send pending frames every FLUSH_INTERVAL until the queue is drained."""
+        while self._pending:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            pending, self._pending = self._pending, {}
+            await asyncio.gather(
+                *(self._send_farm(farm_id, payload) for farm_id, payload in pending.items())
+            )
+    
+    async def _send_farm(self, farm_id: str, payload: str):
+        """Send an encoded frame to every client of a farm, dropping failures."""
+        connections = list(self.active_connections.get(farm_id, ()))
+        
+        # Send concurrently so one slow client doesn't delay the others
+        results = await asyncio.gather(
+            *(self._send(connection, payload) for connection in connections),
+            return_exceptions=True
+        )
         
         # Clean up disconnected clients
-        for connection in disconnected:
-            await self.disconnect(connection, farm_id)
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.error("Error broadcasting to client: %s", result)
+                await self.disconnect(connection, farm_id)
     
-    async def broadcast_to_all(self, message: dict):
-        """Broadcast a message to all connected clients."""
-        disconnected = []
+    @staticmethod
+    async def _send(connection: WebSocket, payload: str):
+        """
+        Send a frame, failing with TimeoutError if the client stops reading.
         
-        for connection in self.all_connections:
+        A timed-out socket is also closed (1011), which ends its handler's
+        receive loop and tells the client to reconnect; callers only prune
+        the bookkeeping.
+        """
+        try:
+            await asyncio.wait_for(connection.send_text(payload), SEND_TIMEOUT)
+        except asyncio.TimeoutError:
             try:
-                await connection.send_json(message)
-            except Exception:
-                disconnected.append(connection)
+                await asyncio.wait_for(connection.close(code=1011), CLOSE_TIMEOUT)
+            except Exception as e:
+                logger.warning("Could not close stalled client: %r", e)
+            raise
+    
+    async def broadcast_to_all(self, message: Message):
+        """Broadcast a message to all connected clients."""
+        payload = encode_message(message)
+        connections = list(self.all_connections)
+        
+        results = await asyncio.gather(
+            *(self._send(connection, payload) for connection in connections),
+            return_exceptions=True
+        )
         
-        # We can't easily clean up here without farm_id
-        # Those connections will be cleaned up on their next message attempt
+        # Clean up disconnected clients (farm is found via the reverse index)
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.error("Error broadcasting to client: %s", result)
+                await self.disconnect(connection)
     
     def get_connection_count(self, farm_id: str = None) -> int:
         """Get the number of active connections."""
@@ -4,7 +4,7 @@ Agri-Nexus Pydantic Models
 Data validation schemas for the API.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
@@ -154,6 +154,9 @@ class WebSocketPayload(BaseModel):
 # Research & AI Models
 # ============================================
 class GeoLookupResponse(BaseModel):
+    # Frozen: the geo service caches and shares these between requests
+    model_config = ConfigDict(frozen=True)
+    
     city: Optional[str] = None
     state: Optional[str] = None
     country: Optional[str] = None
@@ -162,6 +165,9 @@ class GeoLookupResponse(BaseModel):
 
 
 class CropFeasibility(BaseModel):
+    # Frozen: the crop engine caches and shares these between responses
+    model_config = ConfigDict(frozen=True)
+    
     crop_name: str
     feasibility_score: float = Field(..., ge=0, le=100)
     roi_estimate: Optional[float] = None
@@ -171,6 +177,8 @@ class CropFeasibility(BaseModel):
 
 
 class RiskAssessment(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     risk_type: str
     probability: float = Field(..., ge=0, le=100)
     description: str
@@ -5,24 +5,37 @@ AI-powered chatbot using Google Gemini for farmer assistance.
 """
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
+from functools import lru_cache
 from typing import List, Optional
+import hashlib
 import logging
 import google.generativeai as genai
 
 from app.core.config import settings
 from app.services.simulation_engine import get_simulator
+from app.utils.cache import TTLCache
 
 router = APIRouter()
 logger = logging.getLogger("agri-nexus.chat")
 
 # Configure Gemini
+@lru_cache(maxsize=1)
 def get_gemini_model():
-    """Initialize Gemini model with API key."""
+    """
+    Get the shared Gemini model, initialized once per process.
+    
+    The static assistant persona is passed as the system instruction so it
+    forms a stable, cacheable prefix for every request.
+    Returns None when no API key is configured.
+    """
     if not settings.GEMINI_API_KEY:
         return None
     genai.configure(api_key=settings.GEMINI_API_KEY)
-    return genai.GenerativeModel(settings.GEMINI_MODEL)
+    return genai.GenerativeModel(
+        settings.GEMINI_MODEL,
+        system_instruction=FARM_ASSISTANT_PROMPT
+    )
 
 
 # Request/Response models
@@ -31,9 +44,23 @@ class ChatMessage(BaseModel):
     content: str
 
 
+# Number of previous messages included in the prompt
+HISTORY_WINDOW = 6
+
+
 class ChatRequest(BaseModel):
     message: str
     history: Optional[List[ChatMessage]] = []
+    
+    @field_validator("history", mode="before")
+    @classmethod
+    def keep_recent_history(cls, value):
+        """Drop messages outside the prompt window before they are validated."""
+        if value is None:
+            return []
+        if isinstance(value, list):
+            return value[-HISTORY_WINDOW:]
+        return value
 
 
 class ChatResponse(BaseModel):
@@ -41,7 +68,12 @@ class ChatResponse(BaseModel):
     sensor_context: dict
 
 
-# System prompt for farm assistant
+# System prompt for farm assistant.
+# Passed once as the model's system_instruction when get_gemini_model()
+# builds the cached client, so it is not repeated in each request body.
+# Keep it free of placeholders, timestamps and anything else that varies
+# between calls - live sensor data and conversation history go in the
+# per-request prompt instead.
 FARM_ASSISTANT_PROMPT = """You are "Krishi Mitra" (कृषि मित्र), a friendly and knowledgeable AI farming assistant for Indian farmers.
 
 **Your Personality:**
@@ -60,11 +92,8 @@ FARM_ASSISTANT_PROMPT = """You are "Krishi Mitra" (कृषि मित्र)
 - Government schemes for farmers (PM-KISAN, crop insurance, etc.)
 - Organic farming practices
 
-**Current Farm Conditions (LIVE DATA):**
-{sensor_data}
-
 **Guidelines:**
-1. Always consider the current sensor data when giving advice
+1. Always consider the current sensor data (given below as LIVE DATA) when giving advice
 2. If moisture is low, remind about irrigation
 3. If temperature is extreme, warn about crop stress
 4. Be specific to Indian agriculture context
@@ -74,35 +103,81 @@ FARM_ASSISTANT_PROMPT = """You are "Krishi Mitra" (कृषि मित्र)
 
 Remember: You're talking to a real farmer who needs practical help, not academic lectures."""
 
+# Separates the static prefix from the per-request dynamic suffix
+LIVE_DATA_HEADER = "\n\n## LIVE DATA\n**Current Farm Conditions:**"
+
+# Speaker labels used in the conversation transcript
+ROLE_LABELS = {"user": "Farmer", "assistant": "Krishi Mitra"}
+
+# Cache of generated answers, keyed by question + coarse farm conditions
+_response_cache = TTLCache(maxsize=512, ttl=600)
+
 
 def get_sensor_context() -> dict:
-    """Get current sensor readings for context."""
+    """Get current sensor readings for context (precomputed once per tick)."""
+    return get_simulator().get_sensor_snapshot()
+
+
+# Prompt qualifier thresholds; also part of the response cache key so a
+# cached reply is never replayed across a "Hot!"/"Dry" boundary
+HOT_TEMPERATURE = 35
+DRY_SOIL_MOISTURE = 40
+
+
+def _response_cache_key(request: ChatRequest) -> bytes:
+    """
+    Build the response cache key for a chat request.
+
+    The message and recent history are whitespace/case normalized and the
+    sensor readings are quantized (2°C, 5% buckets) so that small sensor
+    fluctuations don't bust the cache. The prompt's hot/dry flags and the
+    active alert types are included so crossing a threshold or a new alert
+    invalidates previously cached advice.
+    """
     simulator = get_simulator()
     state = simulator.state
-    
-    return {
-        "temperature": f"{state.temperature:.1f}°C",
-        "humidity": f"{state.humidity:.1f}%",
-        "soil_moisture": f"{state.soil_moisture:.1f}%",
-        "pressure": f"{state.pressure:.1f} hPa",
-        "is_raining": state.is_raining,
-        "condition": "Raining" if state.is_raining else ("Hot" if state.temperature > 35 else "Normal"),
-        "alerts": [alert.message for alert in simulator.get_alerts()]
-    }
+
+    parts = [
+        f"{msg.role}:{' '.join(msg.content.lower().split())}"
+        for msg in request.history
+    ]
+    parts.append(" ".join(request.message.lower().split()))
+    parts.append(
+        f"{int(state.temperature // 2)}|{int(state.humidity // 5)}|"
+        f"{int(state.soil_moisture // 5)}|{state.is_raining}|"
+        f"{state.temperature > HOT_TEMPERATURE}|{state.soil_moisture < DRY_SOIL_MOISTURE}|"
+        + ",".join(sorted(alert.type.value for alert in simulator.get_alerts()))
+    )
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=16).digest()
+
+
+# Qualifier tags indexed by a boolean threshold check (False -> 0, True -> 1)
+_TEMP_TAGS = ("", " 🔥 (Hot!)")
+_MOISTURE_TAGS = ("", " 💧 (Dry - needs water!)")
 
 
 def format_sensor_for_prompt(sensor_data: dict) -> str:
-    """Format sensor data for the system prompt."""
+    """
+    Format numeric sensor data (the simulator's raw snapshot) for the prompt.
+    
+    Values are rounded to 1°C / 5% buckets here (not in the display APIs)
+    so the prompt text only changes when conditions meaningfully change.
+    This keeps the provider prompt cache and our response cache warm
+    across small sensor fluctuations.
+    """
     alert_text = ""
     if sensor_data["alerts"]:
         alert_text = f"\n⚠️ Active Alerts: {', '.join(sensor_data['alerts'])}"
     
-    return f"""
-- Temperature: {sensor_data['temperature']} {'🔥 (Hot!)' if float(sensor_data['temperature'].replace('°C','')) > 35 else ''}
-- Humidity: {sensor_data['humidity']}
-- Soil Moisture: {sensor_data['soil_moisture']} {'💧 (Dry - needs water!)' if float(sensor_data['soil_moisture'].replace('%','')) < 40 else ''}
-- Weather: {sensor_data['condition']}{alert_text}
-"""
+    temperature = sensor_data["temperature"]
+    soil_moisture = sensor_data["soil_moisture"]
+    
+    return (
+        f"\n- Temperature: {round(temperature)}°C{_TEMP_TAGS[temperature > HOT_TEMPERATURE]}"
+        f"\n- Humidity: {5 * round(sensor_data['humidity'] / 5)}%"
+        f"\n- Soil Moisture: {5 * round(soil_moisture / 5)}%{_MOISTURE_TAGS[soil_moisture < DRY_SOIL_MOISTURE]}"
+        f"\n- Weather: {sensor_data['condition']}{alert_text}\n"
+    )
 
 
 @router.post("/chat", response_model=ChatResponse)
@@ -125,29 +200,34 @@ async def chat_with_assistant(request: ChatRequest):
             sensor_context=get_sensor_context()
         )
     
+    # Identical question under the same conditions - skip the LLM call
+    cache_key = _response_cache_key(request)
+    cached = _response_cache.get(cache_key)
+    if cached is not None:
+        return ChatResponse(response=cached, sensor_context=get_sensor_context())
+    
     try:
         # Get current sensor data
-        sensor_data = get_sensor_context()
-        sensor_text = format_sensor_for_prompt(sensor_data)
-        
-        # Build the system prompt with live data
-        system_prompt = FARM_ASSISTANT_PROMPT.format(sensor_data=sensor_text)
+        simulator = get_simulator()
+        sensor_data = simulator.get_sensor_snapshot()
+        sensor_text = format_sensor_for_prompt(simulator.get_raw_snapshot())
         
-        # Build conversation context
-        conversation = system_prompt + "\n\n"
+        # The static prefix is the model's system instruction; only the
+        # live data, history and question are sent per request
+        parts = [LIVE_DATA_HEADER, sensor_text, "\n"]
         
         # Add recent history
-        for msg in request.history[-6:]:  # Keep last 6 messages
-            role = "Farmer" if msg.role == "user" else "Krishi Mitra"
-            conversation += f"{role}: {msg.content}\n\n"
+        for msg in request.history:
+            parts.append(f"{ROLE_LABELS.get(msg.role, 'Krishi Mitra')}: {msg.content}\n\n")
         
         # Add current question
-        conversation += f"Farmer: {request.message}\n\nKrishi Mitra:"
+        parts.append(f"Farmer: {request.message}\n\nKrishi Mitra:")
         
         # Generate response using simple content generation
-        response = model.generate_content(conversation)
+        response = model.generate_content("".join(parts))
         
-        logger.info(f"Chat response generated for: {request.message[:50]}...")
+        logger.info("Chat response generated for: %s...", request.message[:50])
+        _response_cache.set(cache_key, response.text)
         
         return ChatResponse(
             response=response.text,
@@ -155,7 +235,7 @@ async def chat_with_assistant(request: ChatRequest):
         )
         
     except Exception as e:
-        logger.error(f"Chat error: {str(e)}")
+        logger.error("Chat error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Chat service error: {str(e)}"
@@ -5,24 +5,97 @@ Deep Research Agent endpoints for AI-powered farm analysis.
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
+from types import MappingProxyType
+import asyncio
 import logging
+import zlib
 
+import numpy as np
+
+from app.core.responses import ORJSONResponse
 from app.models.schemas import (
     FullScanRequest, FullScanResponse, GeoLookupResponse,
     CropFeasibility, RiskAssessment
 )
 from app.services.geo_service import get_geo_service, get_soil_service
-from app.services.crop_engine import get_crop_engine, get_risk_predictor
+from app.services.crop_engine import (
+    get_crop_engine, get_risk_predictor, ScanContext,
+    CROP_DATABASE, CROP_IDX, YIELD_ARR, PRICE_ARR, COST_ARR
+)
 from app.services.simulation_engine import get_simulator
+from app.utils.cache import TTLCache
 
 router = APIRouter()
 logger = logging.getLogger("agri-nexus.research")
 
+# Full-scan cache. Coordinates are rounded to 3 decimals (~100 m grid) so
+# repeat scans of the same field share an entry. Location lookups and crop
+# recommendations are cached by their services, so they get no layer here.
+COORD_PRECISION = 3
+_scan_cache = TTLCache(maxsize=256, ttl=900)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
-@router.post("/research/full-scan", response_model=FullScanResponse)
-async def full_farm_scan(request: FullScanRequest):
+def _conditions_bucket(state) -> tuple:
+    """Coarse simulator conditions, so cached scans follow big weather shifts."""
+    return (int(state.temperature // 2), int(state.humidity // 5), state.is_raining)
+
+
+def _scan_cache_key(request: FullScanRequest, state) -> tuple:
+    """
+    Cache key for a full scan: rounded location, inputs, conditions and day.
+    
+    The day keeps a scan cached before midnight from serving yesterday's
+    market fixtures. Live readings and alerts are re-stamped on every hit
+    (see _restamp_scan) rather than keyed, since they change each tick.
+    """
+    return (
+        round(request.lat, COORD_PRECISION),
+        round(request.lon, COORD_PRECISION),
+        request.soil_type,
+        request.farm_size,
+        request.budget,
+        _conditions_bucket(state),
+        date.today()
+    )
+
+
+def _current_conditions(state) -> dict:
+    """Live simulator readings for the weather_analysis section."""
+    return {
+        "temperature": state.temperature,
+        "humidity": state.humidity,
+        "pressure": state.pressure,
+        "soil_moisture": state.soil_moisture,
+        "is_raining": state.is_raining
+    }
+
+
+def _restamp_scan(cached: FullScanResponse, simulator) -> FullScanResponse:
+    """Copy of a cached scan with the live readings, alerts and time refreshed."""
+    weather_analysis = {
+        **cached.weather_analysis,
+        "current": _current_conditions(simulator.state),
+        "current_alerts": simulator.get_alerts_dumped()
+    }
+    return cached.model_copy(update={
+        "weather_analysis": weather_analysis,
+        "generated_at": datetime.now()
+    })
+
+
+@router.post(
+    "/research/full-scan",
+    response_model=FullScanResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}}
+)
+async def full_farm_scan(request: FullScanRequest, stream: bool = False):
     """
     Comprehensive AI-powered farm analysis.
     
@@ -34,23 +107,78 @@ async def full_farm_scan(request: FullScanRequest):
     - Risk assessment and mitigation strategies
     - Economic ROI projections
     
+    With ``?stream=true`` the response is NDJSON (application/x-ndjson):
+    one ``{"<field>": value}`` line per FullScanResponse field, sent as
+    soon as that section is ready, so clients can render the location
+    before the rest of the analysis completes.
+    
     Args:
         request: FullScanRequest with lat, lon, farm_size, budget
+        stream: Stream sections as NDJSON instead of one JSON object
         
     Returns:
         FullScanResponse with complete analysis
     """
-    logger.info(f"Starting full scan for location: {request.lat}, {request.lon}")
+    simulator = get_simulator()
+    cache_key = _scan_cache_key(request, simulator.state)
+    cached = _scan_cache.get(cache_key)
+    if cached is not None:
+        cached = _restamp_scan(cached, simulator)
+    
+    if stream:
+        if cached is not None:
+            sections = ((name, getattr(cached, name)) for name in FullScanResponse.model_fields)
+            return StreamingResponse(_iter_ndjson(sections), media_type=NDJSON_MEDIA_TYPE)
+        return StreamingResponse(
+            _stream_scan(request, simulator, cache_key),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+    
+    if cached is not None:
+        return cached
+    
+    sections = {name: value async for name, value in _scan_sections(request, simulator)}
+    return _store_scan(cache_key, FullScanResponse(**sections))
+
+
+async def _stream_scan(request: FullScanRequest, simulator, cache_key: tuple):
+    """Yield NDJSON lines for each scan section, caching the assembled result."""
+    sections = {}
+    async for name, value in _scan_sections(request, simulator):
+        sections[name] = value
+        yield to_json({name: value}) + b"\n"
+    _store_scan(cache_key, FullScanResponse(**sections))
+
+
+def _iter_ndjson(sections):
+    """Encode (name, value) sections as NDJSON lines."""
+    for name, value in sections:
+        yield to_json({name: value}) + b"\n"
+
+
+def _store_scan(cache_key: tuple, response: FullScanResponse) -> FullScanResponse:
+    """Cache a completed scan unless the geocoder failed."""
+    if response.location.elevation_meters is not None:
+        _scan_cache.set(cache_key, response)
+    return response
+
+
+async def _scan_sections(request: FullScanRequest, simulator):
+    """
+    Run the full-scan pipeline, yielding (field, value) pairs for
+    FullScanResponse as each section completes.
+    """
+    logger.info("Starting full scan for location: %s, %s", request.lat, request.lon)
     
     # Get services
     geo_service = get_geo_service()
     soil_service = get_soil_service()
     crop_engine = get_crop_engine()
     risk_predictor = get_risk_predictor()
-    simulator = get_simulator()
     
     # 1. Location Analysis
     location_data = await geo_service.lookup_location(request.lat, request.lon)
+    yield "location", location_data
     
     # 2. Soil Analysis
     soil_data = soil_service.estimate_soil_type(
@@ -63,6 +191,7 @@ async def full_farm_scan(request: FullScanRequest):
         request.soil_type.value if request.soil_type 
         else soil_data.get("type", "Loamy")
     )
+    yield "soil_analysis", soil_data
     
     # 3. Weather Data (from simulation)
     current_state = simulator.state
@@ -75,46 +204,40 @@ async def full_farm_scan(request: FullScanRequest):
     elif location_data.terrain_type and "Desert" in location_data.terrain_type:
         base_rainfall = 400
     
-    # Weather trends analysis
-    weather_trends = _get_weather_trends(request.lat, request.lon, location_data.state)
+    # Conditions shared by crop scoring and risk assessment
+    ctx = ScanContext.build(
+        temp=current_state.temperature,
+        humidity=current_state.humidity,
+        rainfall=base_rainfall,
+        soil_type=soil_type_str,
+        budget=request.budget
+    )
+    
+    # Weather trends and crop scoring only depend on the location/soil
+    # results, so run them off the event loop concurrently
+    weather_trends, crop_recommendations = await asyncio.gather(
+        asyncio.to_thread(_get_weather_trends, request.lat, request.lon, location_data.state),
+        asyncio.to_thread(crop_engine.recommend, ctx, 5)
+    )
     
     weather_analysis = {
-        "current": {
-            "temperature": current_state.temperature,
-            "humidity": current_state.humidity,
-            "pressure": current_state.pressure,
-            "soil_moisture": current_state.soil_moisture,
-            "is_raining": current_state.is_raining
-        },
+        "current": _current_conditions(current_state),
         "estimated_annual_rainfall": base_rainfall,
         "climate_zone": _classify_climate(current_state.temperature, current_state.humidity),
-        "current_alerts": [alert.model_dump() for alert in simulator.get_alerts()],
+        "current_alerts": simulator.get_alerts_dumped(),
         "trends": weather_trends
     }
+    yield "weather_analysis", weather_analysis
+    yield "crop_recommendations", crop_recommendations
     
-    # 4. Crop Recommendations
-    crop_recommendations = crop_engine.get_recommendations(
-        avg_temp=current_state.temperature,
-        avg_humidity=current_state.humidity,
-        annual_rainfall=base_rainfall,
-        soil_type=soil_type_str,
-        budget=request.budget,
-        top_n=5
-    )
-    
-    # 5. Risk Assessment
+    # 4. Risk Assessment
     risks = []
     if crop_recommendations:
         top_crop = crop_recommendations[0].crop_name
-        risks = risk_predictor.get_risk_assessments(
-            crop=top_crop,
-            humidity=current_state.humidity,
-            temp=current_state.temperature,
-            soil_type=soil_type_str,
-            rainfall=base_rainfall
-        )
+        risks = risk_predictor.assess(top_crop, ctx)
+    yield "risks", risks
     
-    # 6. Economic Analysis
+    # 5. Economic Analysis
     economic_analysis = None
     if request.farm_size and request.budget:
         economic_analysis = _calculate_economics(
@@ -122,25 +245,17 @@ async def full_farm_scan(request: FullScanRequest):
             request.farm_size, 
             request.budget
         )
+    yield "economic_analysis", economic_analysis
     
-    # 7. Market Analysis (NEW)
+    # 6. Market Analysis (NEW)
     market_analysis = _get_market_analysis(
         [c.crop_name for c in crop_recommendations[:5]],
         location_data.state
     )
+    yield "market_analysis", market_analysis
     
-    logger.info(f"Full scan complete. Found {len(crop_recommendations)} crop recommendations.")
-    
-    return FullScanResponse(
-        location=location_data,
-        soil_analysis=soil_data,
-        weather_analysis=weather_analysis,
-        crop_recommendations=crop_recommendations,
-        risks=risks,
-        economic_analysis=economic_analysis,
-        market_analysis=market_analysis,
-        generated_at=datetime.now()
-    )
+    logger.info("Full scan complete. Found %d crop recommendations.", len(crop_recommendations))
+    yield "generated_at", datetime.now()
 
 
 @router.get("/geo/lookup")
@@ -155,7 +270,8 @@ async def geo_lookup(lat: float, lon: float):
     Returns:
         Location info with city, state, country, elevation, terrain
     """
-    if not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
+    # Written so NaN fails too (every comparison with NaN is False)
+    if not (abs(lat) <= 90 and abs(lon) <= 180):
         raise HTTPException(
             status_code=400,
             detail="Invalid coordinates. Lat must be -90 to 90, Lon must be -180 to 180"
@@ -169,7 +285,7 @@ async def geo_lookup(lat: float, lon: float):
         slope, recommendation = geo_service.estimate_slope(location.elevation_meters)
         frost_prone, frost_msg = geo_service.check_frost_risk(lat, location.elevation_meters)
         
-        return {
+        response = {
             **location.model_dump(),
             "slope": {
                 "percentage": slope,
@@ -180,6 +296,8 @@ async def geo_lookup(lat: float, lon: float):
                 "message": frost_msg
             }
         }
+        # Plain JSON types only, so skip FastAPI's jsonable_encoder pass
+        return ORJSONResponse(response)
     
     return location
 
@@ -244,28 +362,21 @@ async def calculate_roi(
     Returns:
         Detailed ROI projection
     """
-    from app.services.crop_engine import CROP_DATABASE
-    
-    if crop not in CROP_DATABASE:
+    if crop not in CROP_IDX:
         raise HTTPException(
             status_code=404,
             detail=f"Crop '{crop}' not found in database"
         )
     
     crop_data = CROP_DATABASE[crop]
+    i = CROP_IDX[crop]
     
     # Calculate projections
-    total_yield = crop_data.yield_per_acre * acres
-    gross_revenue = total_yield * crop_data.market_price_per_kg
-    
-    # Estimate costs
-    cost_per_acre = {
-        "low": 15000,
-        "medium": 25000,
-        "high": 40000
-    }.get(crop_data.water_requirement, 25000)
+    total_yield = float(YIELD_ARR[i] * acres)
+    gross_revenue = float(total_yield * PRICE_ARR[i])
     
-    total_cost = cost_per_acre * acres
+    # Estimate costs (per-acre cost depends on water requirement)
+    total_cost = float(COST_ARR[i] * acres)
     net_profit = gross_revenue - total_cost
     roi_percentage = (net_profit / total_cost) * 100 if total_cost > 0 else 0
     
@@ -307,28 +418,24 @@ def _calculate_economics(
     budget: float
 ) -> dict:
     """Calculate economic projections for top crops."""
-    from app.services.crop_engine import CROP_DATABASE
-    
-    projections = []
-    
-    for crop_rec in crops[:3]:  # Top 3 crops
-        crop_name = crop_rec.crop_name
-        if crop_name in CROP_DATABASE:
-            crop = CROP_DATABASE[crop_name]
-            
-            total_yield = crop.yield_per_acre * farm_size
-            revenue = total_yield * crop.market_price_per_kg
-            cost = revenue * 0.45  # Assume 45% cost ratio
-            profit = revenue - cost
-            
-            projections.append({
-                "crop": crop_name,
-                "investment_required": cost,
-                "expected_revenue": revenue,
-                "expected_profit": profit,
-                "roi_percentage": round((profit / cost) * 100, 1) if cost > 0 else 0,
-                "within_budget": cost <= budget
-            })
+    names = [c.crop_name for c in crops[:3] if c.crop_name in CROP_IDX]  # Top 3 crops
+    idx = np.fromiter((CROP_IDX[name] for name in names), dtype=np.intp, count=len(names))
+    
+    revenue = YIELD_ARR[idx] * farm_size * PRICE_ARR[idx]
+    cost = revenue * 0.45  # Assume 45% cost ratio
+    profit = revenue - cost
+    
+    projections = [
+        {
+            "crop": name,
+            "investment_required": c,
+            "expected_revenue": r,
+            "expected_profit": p,
+            "roi_percentage": round((p / c) * 100, 1) if c > 0 else 0,
+            "within_budget": c <= budget
+        }
+        for name, r, c, p in zip(names, revenue.tolist(), cost.tolist(), profit.tolist())
+    ]
     
     return {
         "farm_size_acres": farm_size,
@@ -338,160 +445,229 @@ def _calculate_economics(
     }
 
 
-def _get_weather_trends(lat: float, lon: float, state: str) -> dict:
-    """
-    Generate weather trends for the location.
-    In production, this would fetch from a weather API with historical data.
+# ============================================
+# Weather Trend Tables
+# ============================================
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+          "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# Indian cropping seasons. Returned by reference in every trends response,
+# so it must not be mutated (MappingProxyType can't be JSON-encoded by
+# pydantic-core/orjson, hence a plain dict).
+SEASONS = {
+    "kharif": {
+        "period": "June - October",
+        "conditions": "Monsoon, high humidity, warm",
+        "suitable_crops": ("Rice", "Cotton", "Sugarcane", "Maize")
+    },
+    "rabi": {
+        "period": "November - March", 
+        "conditions": "Winter, moderate rainfall, cool nights",
+        "suitable_crops": ("Wheat", "Mustard", "Chickpea", "Potato")
+    },
+    "zaid": {
+        "period": "March - June",
+        "conditions": "Summer, hot, irrigation dependent",
+        "suitable_crops": ("Watermelon", "Cucumber", "Muskmelon", "Vegetables")
+    }
+}
+
+
+def _season_for_month(month: int) -> str:
+    """Indian cropping season for a calendar month (1-12)."""
+    if 6 <= month <= 10:
+        return "kharif"
+    elif month >= 11 or month <= 3:
+        return "rabi"
+    return "zaid"
+
+
+# Season lookup indexed by calendar month (index 0 unused)
+SEASON_BY_MONTH = ("",) + tuple(_season_for_month(m) for m in range(1, 13))
+
+# Monthly sine phase of the temperature curve (peaks in May-June)
+MONTH_PHASE = np.sin((np.arange(12) - 1) * np.pi / 6)
+
+# Inclusive (low, high) monthly rainfall bounds in mm:
+# dry season Jan-May, monsoon Jun-Sep, post-monsoon Oct-Dec
+RAIN_BOUNDS_COASTAL = (
+    np.array([5] * 5 + [150] * 4 + [20] * 3),
+    np.array([40] * 5 + [350] * 4 + [80] * 3)
+)
+RAIN_BOUNDS_INLAND = (
+    np.array([5] * 5 + [80] * 4 + [20] * 3),
+    np.array([40] * 5 + [200] * 4 + [80] * 3)
+)
+
+
+@lru_cache(maxsize=1024)
+def _location_climate(lat: float, lon: float, state: str) -> dict:
     """
-    import random
-    import math
+    Monthly temperature/rainfall fixture for a (rounded) location.
     
+    Deterministic per location, so it is computed once and shared between
+    requests; callers must treat the returned lists as read-only.
+    """
     # Base values adjusted by latitude (tropical vs temperate)
     is_tropical = abs(lat) < 23.5
     is_coastal = abs(lon) > 75 or abs(lon) < 78  # Rough India coastal check
     
-    # Monthly temperature variation (simulated)
-    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", 
-              "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-    
     base_temp = 28 if is_tropical else 22
     temp_variation = 8 if not is_tropical else 5
     
-    monthly_temps = []
-    monthly_rainfall = []
+    # Temperature follows a sine wave peaking in May-June
+    temps = base_temp + temp_variation * MONTH_PHASE
     
-    for i, month in enumerate(months):
-        # Temperature follows a sine wave peaking in May-June
-        temp = base_temp + temp_variation * math.sin((i - 1) * math.pi / 6)
-        monthly_temps.append({"month": month, "avg_temp": round(temp, 1)})
-        
-        # Rainfall peaks during monsoon (Jun-Sep for India)
-        if 5 <= i <= 8:  # Monsoon months
-            rain = random.randint(150, 350) if is_coastal else random.randint(80, 200)
-        elif 9 <= i <= 11:  # Post-monsoon
-            rain = random.randint(20, 80)
-        else:  # Dry season
-            rain = random.randint(5, 40)
-        monthly_rainfall.append({"month": month, "rainfall_mm": rain})
-    
-    # Seasonal analysis
-    seasons = {
-        "kharif": {
-            "period": "June - October",
-            "conditions": "Monsoon, high humidity, warm",
-            "suitable_crops": ["Rice", "Cotton", "Sugarcane", "Maize"]
-        },
-        "rabi": {
-            "period": "November - March", 
-            "conditions": "Winter, moderate rainfall, cool nights",
-            "suitable_crops": ["Wheat", "Mustard", "Chickpea", "Potato"]
-        },
-        "zaid": {
-            "period": "March - June",
-            "conditions": "Summer, hot, irrigation dependent",
-            "suitable_crops": ["Watermelon", "Cucumber", "Muskmelon", "Vegetables"]
-        }
+    # Rainfall peaks during monsoon (Jun-Sep for India). Seeded per location
+    # so repeated scans of the same field get the same trend.
+    low, high = RAIN_BOUNDS_COASTAL if is_coastal else RAIN_BOUNDS_INLAND
+    seed = zlib.crc32(f"{lat},{lon},{state}".encode())
+    rains = np.random.default_rng(seed).integers(low, high, endpoint=True).tolist()
+    
+    return {
+        "is_tropical": is_tropical,
+        "monthly_temperature": [
+            {"month": month, "avg_temp": round(temp, 1)}
+            for month, temp in zip(MONTHS, temps.tolist())
+        ],
+        "monthly_rainfall": [
+            {"month": month, "rainfall_mm": rain}
+            for month, rain in zip(MONTHS, rains)
+        ],
+        "annual_rainfall_mm": sum(rains)
     }
+
+
+def _get_weather_trends(lat: float, lon: float, state: str) -> dict:
+    """
+    Generate weather trends for the location.
+    In production, this would fetch from a weather API with historical data.
+    """
+    climate = _location_climate(round(lat, 2), round(lon, 2), state)
+    is_tropical = climate["is_tropical"]
     
     # Current season
-    from datetime import datetime
-    month = datetime.now().month
-    if 6 <= month <= 10:
-        current_season = "kharif"
-    elif month >= 11 or month <= 3:
-        current_season = "rabi"
-    else:
-        current_season = "zaid"
+    current_season = SEASON_BY_MONTH[date.today().month]
     
     return {
-        "monthly_temperature": monthly_temps,
-        "monthly_rainfall": monthly_rainfall,
-        "annual_rainfall_mm": sum(r["rainfall_mm"] for r in monthly_rainfall),
-        "seasons": seasons,
+        "monthly_temperature": climate["monthly_temperature"],
+        "monthly_rainfall": climate["monthly_rainfall"],
+        "annual_rainfall_mm": climate["annual_rainfall_mm"],
+        "seasons": SEASONS,
         "current_season": current_season,
         "climate_summary": f"{'Tropical' if is_tropical else 'Subtropical'} climate with monsoon influence. "
-                          f"Best growing season: {seasons[current_season]['period']}"
+                          f"Best growing season: {SEASONS[current_season]['period']}"
+    }
+
+
+# ============================================
+# Market Tables
+# ============================================
+# Market data for crops (simulated realistic Indian market)
+MARKET_DATA = MappingProxyType({
+    "Rice": {"msp": 2183, "market_price": 2400, "demand": "high", "export_potential": "medium"},
+    "Wheat": {"msp": 2125, "market_price": 2350, "demand": "high", "export_potential": "low"},
+    "Cotton": {"msp": 6620, "market_price": 7200, "demand": "high", "export_potential": "high"},
+    "Sugarcane": {"msp": 315, "market_price": 350, "demand": "high", "export_potential": "medium"},
+    "Maize": {"msp": 2090, "market_price": 2200, "demand": "medium", "export_potential": "medium"},
+    "Soybean": {"msp": 4600, "market_price": 5100, "demand": "high", "export_potential": "high"},
+    "Groundnut": {"msp": 6377, "market_price": 6800, "demand": "medium", "export_potential": "medium"},
+    "Mustard": {"msp": 5650, "market_price": 6200, "demand": "high", "export_potential": "low"},
+    "Chickpea": {"msp": 5440, "market_price": 5800, "demand": "high", "export_potential": "medium"},
+    "Potato": {"msp": 0, "market_price": 1800, "demand": "very high", "export_potential": "low"},
+    "Tomato": {"msp": 0, "market_price": 2500, "demand": "very high", "export_potential": "low"},
+    "Onion": {"msp": 0, "market_price": 2200, "demand": "very high", "export_potential": "medium"},
+    "Turmeric": {"msp": 0, "market_price": 8500, "demand": "high", "export_potential": "high"},
+    "Chilli": {"msp": 0, "market_price": 12000, "demand": "high", "export_potential": "high"},
+    "Banana": {"msp": 0, "market_price": 2000, "demand": "high", "export_potential": "medium"},
+    "Mango": {"msp": 0, "market_price": 5000, "demand": "very high", "export_potential": "high"},
+    "Coconut": {"msp": 0, "market_price": 2500, "demand": "high", "export_potential": "medium"},
+    "Tea": {"msp": 0, "market_price": 25000, "demand": "high", "export_potential": "very high"},
+    "Coffee": {"msp": 0, "market_price": 35000, "demand": "high", "export_potential": "very high"},
+    "Cardamom": {"msp": 0, "market_price": 120000, "demand": "medium", "export_potential": "very high"},
+})
+
+# Regional market info
+REGIONAL_INFO = MappingProxyType({
+    "Karnataka": {"major_market": "APMC Yeshwanthpur, Bangalore", "specialty": "Coffee, Ragi"},
+    "Tamil Nadu": {"major_market": "Koyambedu, Chennai", "specialty": "Rice, Banana"},
+    "Maharashtra": {"major_market": "APMC Vashi, Mumbai", "specialty": "Onion, Sugarcane"},
+    "Punjab": {"major_market": "Grain Market, Ludhiana", "specialty": "Wheat, Rice"},
+    "Gujarat": {"major_market": "APMC Unjha", "specialty": "Cotton, Groundnut"},
+    "Andhra Pradesh": {"major_market": "Guntur Market", "specialty": "Chilli, Rice"},
+    "Uttar Pradesh": {"major_market": "Azadpur Mandi", "specialty": "Potato, Wheat"},
+})
+
+PRICE_TRENDS = ("rising", "stable", "falling")
+SUPPLY_STATUSES = ("surplus", "adequate", "shortage")
+
+
+@lru_cache(maxsize=1)
+def _daily_market_fixtures(day: date) -> dict:
+    """
+    Per-crop market analysis for every crop in MARKET_DATA.
+    
+    Generated once per day (the cache key) rather than per request; the
+    returned dicts are shared and must be treated as read-only. The
+    generator is seeded from the date so every worker process reports the
+    same market for the day.
+    """
+    rng = np.random.default_rng(zlib.crc32(day.isoformat().encode()))
+    
+    # Draw the simulated trend/change/supply for every crop in one go
+    n = len(MARKET_DATA)
+    trends = rng.integers(0, len(PRICE_TRENDS), size=n).tolist()
+    changes = rng.integers(5, 15, size=n, endpoint=True).tolist()
+    supplies = rng.integers(0, len(SUPPLY_STATUSES), size=n).tolist()
+    
+    fixtures = {}
+    
+    for (crop, data), trend_idx, change, supply_idx in zip(MARKET_DATA.items(), trends, changes, supplies):
+        price_trend = PRICE_TRENDS[trend_idx]
+        supply = SUPPLY_STATUSES[supply_idx]
+        
+        fixtures[crop] = {
+            "crop": crop,
+            "current_price_per_quintal": data["market_price"],
+            "msp_per_quintal": data["msp"] if data["msp"] > 0 else "Not applicable",
+            "price_trend": price_trend,
+            "price_change_percent": change if price_trend == "rising" else -change if price_trend == "falling" else 0,
+            "demand_level": data["demand"],
+            "supply_status": supply,
+            "export_potential": data["export_potential"],
+            "market_outlook": OUTLOOK_TABLE[data["demand"], supply, price_trend]
+        }
+    
+    return fixtures
+
+
+def _unknown_crop_market(crop: str) -> dict:
+    """Placeholder market entry for crops without market data."""
+    return {
+        "crop": crop,
+        "current_price_per_quintal": "Data not available",
+        "demand_level": "medium",
+        "supply_status": "adequate",
+        "market_outlook": "Stable market conditions expected"
     }
 
 
+def warm_fixtures():
+    """Precompute today's market fixtures (called at application startup)."""
+    _daily_market_fixtures(date.today())
+
+
 def _get_market_analysis(crops: list, state: str) -> dict:
     """
     Generate market demand/supply analysis for recommended crops.
     In production, this would fetch from agricultural market APIs.
     """
-    import random
-    
-    # Market data for crops (simulated realistic Indian market)
-    market_data = {
-        "Rice": {"msp": 2183, "market_price": 2400, "demand": "high", "export_potential": "medium"},
-        "Wheat": {"msp": 2125, "market_price": 2350, "demand": "high", "export_potential": "low"},
-        "Cotton": {"msp": 6620, "market_price": 7200, "demand": "high", "export_potential": "high"},
-        "Sugarcane": {"msp": 315, "market_price": 350, "demand": "high", "export_potential": "medium"},
-        "Maize": {"msp": 2090, "market_price": 2200, "demand": "medium", "export_potential": "medium"},
-        "Soybean": {"msp": 4600, "market_price": 5100, "demand": "high", "export_potential": "high"},
-        "Groundnut": {"msp": 6377, "market_price": 6800, "demand": "medium", "export_potential": "medium"},
-        "Mustard": {"msp": 5650, "market_price": 6200, "demand": "high", "export_potential": "low"},
-        "Chickpea": {"msp": 5440, "market_price": 5800, "demand": "high", "export_potential": "medium"},
-        "Potato": {"msp": 0, "market_price": 1800, "demand": "very high", "export_potential": "low"},
-        "Tomato": {"msp": 0, "market_price": 2500, "demand": "very high", "export_potential": "low"},
-        "Onion": {"msp": 0, "market_price": 2200, "demand": "very high", "export_potential": "medium"},
-        "Turmeric": {"msp": 0, "market_price": 8500, "demand": "high", "export_potential": "high"},
-        "Chilli": {"msp": 0, "market_price": 12000, "demand": "high", "export_potential": "high"},
-        "Banana": {"msp": 0, "market_price": 2000, "demand": "high", "export_potential": "medium"},
-        "Mango": {"msp": 0, "market_price": 5000, "demand": "very high", "export_potential": "high"},
-        "Coconut": {"msp": 0, "market_price": 2500, "demand": "high", "export_potential": "medium"},
-        "Tea": {"msp": 0, "market_price": 25000, "demand": "high", "export_potential": "very high"},
-        "Coffee": {"msp": 0, "market_price": 35000, "demand": "high", "export_potential": "very high"},
-        "Cardamom": {"msp": 0, "market_price": 120000, "demand": "medium", "export_potential": "very high"},
-    }
-    
-    crop_analysis = []
-    
-    for crop in crops:
-        if crop in market_data:
-            data = market_data[crop]
-            
-            # Price trend (simulated)
-            price_trend = random.choice(["rising", "stable", "falling"])
-            price_change = random.randint(5, 15) if price_trend != "stable" else 0
-            
-            # Supply status
-            supply = random.choice(["surplus", "adequate", "shortage"])
-            
-            crop_analysis.append({
-                "crop": crop,
-                "current_price_per_quintal": data["market_price"],
-                "msp_per_quintal": data["msp"] if data["msp"] > 0 else "Not applicable",
-                "price_trend": price_trend,
-                "price_change_percent": price_change if price_trend == "rising" else -price_change if price_trend == "falling" else 0,
-                "demand_level": data["demand"],
-                "supply_status": supply,
-                "export_potential": data["export_potential"],
-                "market_outlook": _get_market_outlook(data["demand"], supply, price_trend)
-            })
-        else:
-            crop_analysis.append({
-                "crop": crop,
-                "current_price_per_quintal": "Data not available",
-                "demand_level": "medium",
-                "supply_status": "adequate",
-                "market_outlook": "Stable market conditions expected"
-            })
-    
-    # Regional market info
-    regional_info = {
-        "Karnataka": {"major_market": "APMC Yeshwanthpur, Bangalore", "specialty": "Coffee, Ragi"},
-        "Tamil Nadu": {"major_market": "Koyambedu, Chennai", "specialty": "Rice, Banana"},
-        "Maharashtra": {"major_market": "APMC Vashi, Mumbai", "specialty": "Onion, Sugarcane"},
-        "Punjab": {"major_market": "Grain Market, Ludhiana", "specialty": "Wheat, Rice"},
-        "Gujarat": {"major_market": "APMC Unjha", "specialty": "Cotton, Groundnut"},
-        "Andhra Pradesh": {"major_market": "Guntur Market", "specialty": "Chilli, Rice"},
-        "Uttar Pradesh": {"major_market": "Azadpur Mandi", "specialty": "Potato, Wheat"},
-    }
+    fixtures = _daily_market_fixtures(date.today())
+    crop_analysis = [fixtures.get(crop) or _unknown_crop_market(crop) for crop in crops]
     
     return {
         "crop_analysis": crop_analysis,
-        "regional_market": regional_info.get(state, {
+        "regional_market": REGIONAL_INFO.get(state, {
             "major_market": "Local APMC Market",
             "specialty": "Varies by region"
         }),
@@ -516,3 +692,13 @@ def _get_market_outlook(demand: str, supply: str, trend: str) -> str:
         return "➡️ Stable - Balanced market conditions."
     else:
         return "⚠️ Cautious - Consider storage or alternative markets."
+
+
+# Every (demand, supply, trend) combination resolved once at import, so the
+# per-crop outlook is a single dict lookup
+OUTLOOK_TABLE = {
+    (demand, supply, trend): _get_market_outlook(demand, supply, trend)
+    for demand in {data["demand"] for data in MARKET_DATA.values()}
+    for supply in SUPPLY_STATUSES
+    for trend in PRICE_TRENDS
+}
@@ -9,7 +9,7 @@ import asyncio
 import logging
 from datetime import datetime
 
-from app.core.socket_manager import get_connection_manager
+from app.core.socket_manager import get_connection_manager, encode_message
 from app.services.simulation_engine import get_simulator
 from app.models.schemas import WebSocketPayload
 
@@ -17,66 +17,95 @@ router = APIRouter()
 logger = logging.getLogger("agri-nexus.sensors")
 
 
+# Seconds between simulation ticks pushed to clients
+TICK_INTERVAL = 2.0
+
+
+async def sensor_ticker():
+    """
+    Shared simulation loop for all sensor streams.
+    
+    Advances the simulator once per tick (while anyone is connected) and
+    publishes one serialized payload per subscribed farm, instead of every
+    connection running its own loop and stepping the simulation.
+    Started from the application lifespan.
+    """
+    manager = get_connection_manager()
+    simulator = get_simulator()
+    tick_count = 0
+    
+    while True:
+        farms = manager.get_active_farms()
+        if farms:
+            # A failing tick must not end the only ticker task - log it and
+            # try again on the next interval
+            try:
+                # One clock read per tick, shared by the reading and all payloads
+                timestamp = datetime.now()
+                
+                # Update simulation state
+                sensor_reading = simulator.update_state(timestamp)
+                alerts = simulator.get_alerts()
+                
+                for farm_id in farms:
+                    # Build payload (trusted internal data - no re-validation)
+                    payload = WebSocketPayload.model_construct(
+                        farm_id=farm_id,
+                        sensors=sensor_reading,
+                        alerts=alerts,
+                        simulation_status="running",
+                        timestamp=timestamp
+                    )
+                    # Serialized in one pass by pydantic-core
+                    manager.publish_to_farm(payload.model_dump_json(), farm_id)
+                
+                tick_count += 1
+                
+                # Log every 30 ticks (1 minute at 2s interval); skip building the
+                # summary entirely when INFO is filtered out
+                if tick_count % 30 == 0 and logger.isEnabledFor(logging.INFO):
+                    state = simulator.get_state_summary()
+                    logger.info("Simulation tick %d: %s - Temp: %s, Moisture: %s",
+                                tick_count, state["virtual_time"], state["temperature"], state["soil_moisture"])
+            except Exception:
+                logger.exception("Sensor tick failed")
+        
+        await asyncio.sleep(TICK_INTERVAL)
+
+
 @router.websocket("/ws/sensors/{farm_id}")
 async def websocket_sensor_stream(websocket: WebSocket, farm_id: str):
     """
     WebSocket endpoint for real-time sensor data streaming.
     
-    Connects to the simulation engine and broadcasts sensor readings
-    every 2 seconds.
+    Subscribes the client to its farm; readings are pushed every 2 seconds
+    by the shared sensor_ticker.
     
     Args:
         farm_id: The farm to stream sensor data for
     """
     manager = get_connection_manager()
-    simulator = get_simulator()
     
     await manager.connect(websocket, farm_id)
     
     try:
         # Send initial connection message
-        await websocket.send_json({
+        await websocket.send_text(encode_message({
             "type": "connection",
             "status": "connected",
             "farm_id": farm_id,
             "message": "Connected to Agri-Nexus sensor stream",
-            "timestamp": datetime.now().isoformat()
-        })
+            "timestamp": datetime.now()
+        }))
         
-        # Main streaming loop
-        tick_count = 0
+        # Readings are pushed by the ticker; just wait for the client to leave
         while True:
-            # Update simulation state
-            sensor_reading = simulator.update_state()
-            alerts = simulator.get_alerts()
-            
-            # Build payload
-            payload = WebSocketPayload(
-                farm_id=farm_id,
-                sensors=sensor_reading,
-                alerts=alerts,
-                simulation_status="running",
-                timestamp=datetime.now()
-            )
-            
-            # Send to client
-            await websocket.send_json(payload.model_dump(mode="json"))
-            
-            tick_count += 1
-            
-            # Log every 30 ticks (1 minute at 2s interval)
-            if tick_count % 30 == 0:
-                state = simulator.get_state_summary()
-                logger.info(f"Simulation tick {tick_count}: {state['virtual_time']} - "
-                           f"Temp: {state['temperature']}, Moisture: {state['soil_moisture']}")
-            
-            # Wait 2 seconds before next update
-            await asyncio.sleep(2.0)
+            await websocket.receive_text()
             
     except WebSocketDisconnect:
-        logger.info(f"Client disconnected from farm {farm_id}")
+        logger.info("Client disconnected from farm %s", farm_id)
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
     finally:
         await manager.disconnect(websocket, farm_id)
 
@@ -4,17 +4,31 @@ Simulation Control Router
 REST endpoints to control the simulation for demos and testing.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional
 import logging
 
-from app.services.simulation_engine import get_simulator
+from app.core.responses import ORJSONResponse
+from app.services.simulation_engine import (
+    get_simulator, HISTORY_WINDOW,
+    HISTORY_TEMPERATURE, HISTORY_HUMIDITY, HISTORY_SOIL_MOISTURE
+)
 
 router = APIRouter()
 logger = logging.getLogger("agri-nexus.simulation")
 
 
+def _control_response(message: str, **fields) -> ORJSONResponse:
+    """
+    Build the common control-endpoint envelope.
+    
+    The payload is plain JSON data, so it is encoded directly instead of
+    going through FastAPI's jsonable_encoder.
+    """
+    return ORJSONResponse({"success": True, "message": message, **fields})
+
+
 class SimulationControlRequest(BaseModel):
     """Request body for simulation control commands."""
     intensity: Optional[float] = 0.8
@@ -38,17 +52,16 @@ async def trigger_rain(request: SimulationControlRequest = SimulationControlRequ
         duration=request.duration or 30
     )
     
-    logger.info(f"Rain triggered: intensity={request.intensity}, duration={request.duration}")
+    logger.info("Rain triggered: intensity=%s, duration=%s", request.intensity, request.duration)
     
-    return {
-        "success": True,
-        "message": "☔ Rain event triggered!",
-        "details": {
+    return _control_response(
+        "☔ Rain event triggered!",
+        details={
             "intensity": request.intensity,
             "duration_ticks": request.duration,
             "current_state": simulator.get_state_summary()
         }
-    }
+    )
 
 
 @router.post("/drought")
@@ -63,11 +76,7 @@ async def trigger_drought():
     
     logger.info("Drought conditions triggered")
     
-    return {
-        "success": True,
-        "message": "🏜️ Drought conditions activated!",
-        "details": simulator.get_state_summary()
-    }
+    return _control_response("🏜️ Drought conditions activated!", details=simulator.get_state_summary())
 
 
 @router.post("/reset")
@@ -82,11 +91,7 @@ async def reset_simulation():
     
     logger.info("Simulation reset to defaults")
     
-    return {
-        "success": True,
-        "message": "🔄 Simulation reset to default state",
-        "details": simulator.get_state_summary()
-    }
+    return _control_response("🔄 Simulation reset to default state", details=simulator.get_state_summary())
 
 
 @router.get("/state")
@@ -98,7 +103,7 @@ async def get_simulation_state():
     return {
         "tick_count": state.tick_count,
         "virtual_hour": state.virtual_hour,
-        "virtual_time": f"{int(state.virtual_hour):02d}:{int((state.virtual_hour % 1) * 60):02d}",
+        "virtual_time": simulator.get_virtual_time(),
         "environment": {
             "temperature": state.temperature,
             "humidity": state.humidity,
@@ -112,10 +117,50 @@ async def get_simulation_state():
             "rain_ticks_remaining": state.rain_ticks_remaining,
             "wind_speed": state.wind_speed
         },
-        "alerts": [alert.model_dump() for alert in simulator.get_alerts()]
+        "alerts": simulator.get_alerts_dumped()
     }
 
 
+@router.post("/advance")
+async def advance_simulation(ticks: int = Query(30, ge=1, le=HISTORY_WINDOW)):
+    """
+    Fast-forward the simulation by a number of ticks in one call.
+    
+    Runs inline on the event loop: the simulator is shared with the live
+    sensor stream, and a full virtual day (HISTORY_WINDOW ticks) only takes
+    a few milliseconds through update_state_batch.
+    
+    Args:
+        ticks: Number of ticks to advance (1 to HISTORY_WINDOW)
+    """
+    simulator = get_simulator()
+    simulator.update_state_batch(ticks)
+    
+    return _control_response(
+        f"⏩ Advanced {ticks} ticks",
+        current_state=simulator.get_state_summary()
+    )
+
+
+@router.get("/history")
+async def get_simulation_history(ticks: int = Query(60, ge=1, le=HISTORY_WINDOW)):
+    """
+    Get recent readings as columns, oldest first (for charts and replay).
+    
+    Args:
+        ticks: Number of recent ticks to return (1 to HISTORY_WINDOW)
+    """
+    simulator = get_simulator()
+    history = simulator.get_history(ticks)
+    
+    return ORJSONResponse({
+        "end_tick": simulator.state.tick_count,
+        "temperature": history[HISTORY_TEMPERATURE],
+        "humidity": history[HISTORY_HUMIDITY],
+        "soil_moisture": history[HISTORY_SOIL_MOISTURE]
+    })
+
+
 @router.post("/time-jump")
 async def time_jump(hours: int = 6):
     """
@@ -135,9 +180,8 @@ async def time_jump(hours: int = 6):
     # Update temperature for new time
     sensor_reading = simulator.update_state()
     
-    return {
-        "success": True,
-        "message": f"⏰ Jumped forward {hours} hours",
-        "new_time": f"{int(simulator.state.virtual_hour):02d}:00",
-        "current_state": simulator.get_state_summary()
-    }
+    return _control_response(
+        f"⏰ Jumped forward {hours} hours",
+        new_time=f"{int(simulator.state.virtual_hour):02d}:00",
+        current_state=simulator.get_state_summary()
+    )
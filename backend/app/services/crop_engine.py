@@ -4,16 +4,20 @@ Crop Feasibility & Recommendation Engine
 AI-powered crop recommendation based on environmental conditions.
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
 import logging
 
+import numpy as np
+
 from app.models.schemas import CropFeasibility, RiskAssessment
 
 logger = logging.getLogger("agri-nexus.crops")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CropRequirements:
     """Requirements for a specific crop."""
     name: str
@@ -23,7 +27,7 @@ class CropRequirements:
     max_rainfall: float
     min_humidity: float
     max_humidity: float
-    suitable_soils: List[str]
+    suitable_soils: Tuple[str, ...]
     growing_season: str
     water_requirement: str  # low, medium, high
     market_price_per_kg: float  # INR
@@ -38,7 +42,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=20, max_temp=35,
         min_rainfall=1000, max_rainfall=2500,
         min_humidity=60, max_humidity=95,
-        suitable_soils=["Alluvial", "Clay", "Black (Regur)"],
+        suitable_soils=("Alluvial", "Clay", "Black (Regur)"),
         growing_season="Kharif (June-Nov)",
         water_requirement="high",
         market_price_per_kg=25,
@@ -50,7 +54,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=10, max_temp=25,
         min_rainfall=400, max_rainfall=1000,
         min_humidity=40, max_humidity=70,
-        suitable_soils=["Alluvial", "Loamy", "Clay"],
+        suitable_soils=("Alluvial", "Loamy", "Clay"),
         growing_season="Rabi (Oct-Mar)",
         water_requirement="medium",
         market_price_per_kg=22,
@@ -62,7 +66,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=21, max_temp=35,
         min_rainfall=500, max_rainfall=1200,
         min_humidity=50, max_humidity=75,
-        suitable_soils=["Black (Regur)", "Alluvial"],
+        suitable_soils=("Black (Regur)", "Alluvial"),
         growing_season="Kharif (June-Dec)",
         water_requirement="medium",
         market_price_per_kg=65,
@@ -74,7 +78,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=20, max_temp=40,
         min_rainfall=1000, max_rainfall=2000,
         min_humidity=60, max_humidity=90,
-        suitable_soils=["Alluvial", "Loamy", "Black (Regur)"],
+        suitable_soils=("Alluvial", "Loamy", "Black (Regur)"),
         growing_season="Year-round",
         water_requirement="high",
         market_price_per_kg=3,
@@ -86,7 +90,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=20, max_temp=35,
         min_rainfall=500, max_rainfall=1200,
         min_humidity=40, max_humidity=70,
-        suitable_soils=["Red", "Sandy Loam", "Loamy"],
+        suitable_soils=("Red", "Sandy Loam", "Loamy"),
         growing_season="Kharif/Rabi",
         water_requirement="low",
         market_price_per_kg=55,
@@ -98,7 +102,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=20, max_temp=30,
         min_rainfall=500, max_rainfall=1000,
         min_humidity=50, max_humidity=80,
-        suitable_soils=["Black (Regur)", "Loamy"],
+        suitable_soils=("Black (Regur)", "Loamy"),
         growing_season="Kharif (June-Oct)",
         water_requirement="medium",
         market_price_per_kg=42,
@@ -110,7 +114,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=18, max_temp=32,
         min_rainfall=500, max_rainfall=1200,
         min_humidity=50, max_humidity=80,
-        suitable_soils=["Alluvial", "Loamy", "Red"],
+        suitable_soils=("Alluvial", "Loamy", "Red"),
         growing_season="Kharif/Rabi",
         water_requirement="medium",
         market_price_per_kg=18,
@@ -122,7 +126,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=15, max_temp=30,
         min_rainfall=400, max_rainfall=800,
         min_humidity=50, max_humidity=75,
-        suitable_soils=["Loamy", "Alluvial", "Red"],
+        suitable_soils=("Loamy", "Alluvial", "Red"),
         growing_season="Rabi (Oct-Mar)",
         water_requirement="medium",
         market_price_per_kg=30,
@@ -134,7 +138,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=15, max_temp=30,
         min_rainfall=350, max_rainfall=800,
         min_humidity=40, max_humidity=70,
-        suitable_soils=["Loamy", "Alluvial"],
+        suitable_soils=("Loamy", "Alluvial"),
         growing_season="Rabi (Oct-Mar)",
         water_requirement="low",
         market_price_per_kg=25,
@@ -146,7 +150,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=10, max_temp=25,
         min_rainfall=400, max_rainfall=800,
         min_humidity=50, max_humidity=80,
-        suitable_soils=["Loamy", "Sandy Loam", "Alluvial"],
+        suitable_soils=("Loamy", "Sandy Loam", "Alluvial"),
         growing_season="Rabi (Oct-Feb)",
         water_requirement="medium",
         market_price_per_kg=20,
@@ -158,7 +162,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=18, max_temp=35,
         min_rainfall=2000, max_rainfall=4000,
         min_humidity=70, max_humidity=95,
-        suitable_soils=["Laterite", "Alluvial", "Red"],
+        suitable_soils=("Laterite", "Alluvial", "Red"),
         growing_season="Perennial",
         water_requirement="high",
         market_price_per_kg=400,
@@ -170,7 +174,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=20, max_temp=35,
         min_rainfall=1500, max_rainfall=3000,
         min_humidity=60, max_humidity=90,
-        suitable_soils=["Laterite", "Alluvial", "Sandy Loam"],
+        suitable_soils=("Laterite", "Alluvial", "Sandy Loam"),
         growing_season="Perennial",
         water_requirement="medium",
         market_price_per_kg=15,
@@ -182,7 +186,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=15, max_temp=28,
         min_rainfall=1500, max_rainfall=2500,
         min_humidity=70, max_humidity=90,
-        suitable_soils=["Laterite", "Red", "Loamy"],
+        suitable_soils=("Laterite", "Red", "Loamy"),
         growing_season="Perennial",
         water_requirement="medium",
         market_price_per_kg=350,
@@ -194,7 +198,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=13, max_temp=28,
         min_rainfall=1500, max_rainfall=3000,
         min_humidity=70, max_humidity=95,
-        suitable_soils=["Red", "Loamy", "Laterite"],
+        suitable_soils=("Red", "Loamy", "Laterite"),
         growing_season="Perennial",
         water_requirement="high",
         market_price_per_kg=250,
@@ -206,7 +210,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=20, max_temp=35,
         min_rainfall=1000, max_rainfall=2500,
         min_humidity=60, max_humidity=90,
-        suitable_soils=["Alluvial", "Loamy", "Red"],
+        suitable_soils=("Alluvial", "Loamy", "Red"),
         growing_season="Year-round",
         water_requirement="high",
         market_price_per_kg=30,
@@ -218,7 +222,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=20, max_temp=40,
         min_rainfall=800, max_rainfall=2500,
         min_humidity=40, max_humidity=80,
-        suitable_soils=["Alluvial", "Loamy", "Red"],
+        suitable_soils=("Alluvial", "Loamy", "Red"),
         growing_season="Perennial (harvest Mar-Jun)",
         water_requirement="low",
         market_price_per_kg=60,
@@ -230,7 +234,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=18, max_temp=35,
         min_rainfall=600, max_rainfall=1200,
         min_humidity=50, max_humidity=70,
-        suitable_soils=["Loamy", "Alluvial", "Red"],
+        suitable_soils=("Loamy", "Alluvial", "Red"),
         growing_season="Kharif/Rabi",
         water_requirement="medium",
         market_price_per_kg=120,
@@ -242,7 +246,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=20, max_temp=35,
         min_rainfall=1500, max_rainfall=2500,
         min_humidity=70, max_humidity=90,
-        suitable_soils=["Alluvial", "Loamy", "Red"],
+        suitable_soils=("Alluvial", "Loamy", "Red"),
         growing_season="Kharif (Jun-Feb)",
         water_requirement="medium",
         market_price_per_kg=80,
@@ -254,7 +258,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=20, max_temp=32,
         min_rainfall=1500, max_rainfall=3000,
         min_humidity=70, max_humidity=90,
-        suitable_soils=["Loamy", "Alluvial", "Red"],
+        suitable_soils=("Loamy", "Alluvial", "Red"),
         growing_season="Kharif (Apr-Dec)",
         water_requirement="high",
         market_price_per_kg=90,
@@ -266,7 +270,7 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
         min_temp=20, max_temp=35,
         min_rainfall=2000, max_rainfall=4000,
         min_humidity=75, max_humidity=95,
-        suitable_soils=["Laterite", "Red", "Loamy"],
+        suitable_soils=("Laterite", "Red", "Loamy"),
         growing_season="Perennial",
         water_requirement="high",
         market_price_per_kg=500,
@@ -276,13 +280,211 @@ CROP_DATABASE: Dict[str, CropRequirements] = {
 }
 
 
+# ============================================
+# Struct-of-Arrays Economics Tables
+# ============================================
+# Per-crop numbers laid out as parallel arrays (indexed via CROP_IDX) so
+# ROI/economics maths is a few vector ops instead of attribute lookups
+COST_PER_ACRE_BY_WATER = {"low": 15000, "medium": 25000, "high": 40000}
+
+CROP_NAMES: Tuple[str, ...] = tuple(CROP_DATABASE)
+CROP_LIST: Tuple[CropRequirements, ...] = tuple(CROP_DATABASE.values())
+CROP_IDX: Dict[str, int] = {name: i for i, name in enumerate(CROP_NAMES)}
+YIELD_ARR = np.array([c.yield_per_acre for c in CROP_DATABASE.values()], dtype=np.float64)
+PRICE_ARR = np.array([c.market_price_per_kg for c in CROP_DATABASE.values()], dtype=np.float64)
+COST_ARR = np.array(
+    [COST_PER_ACRE_BY_WATER.get(c.water_requirement, 25000) for c in CROP_DATABASE.values()],
+    dtype=np.float64
+)
+
+# Display requirements per crop (static, so formatted once). CropFeasibility
+# validation copies the dict, so responses never share it.
+CROP_REQUIREMENTS: Dict[str, dict] = {
+    name: {
+        "temp_range": f"{crop.min_temp}-{crop.max_temp}°C",
+        "rainfall": f"{crop.min_rainfall}-{crop.max_rainfall}mm",
+        "water_need": crop.water_requirement,
+        "growing_days": crop.growing_days
+    }
+    for name, crop in CROP_DATABASE.items()
+}
+
+
+def _estimate_roi(crop: CropRequirements) -> float:
+    """Static ROI estimate (%) for a crop."""
+    revenue = crop.yield_per_acre * crop.market_price_per_kg
+    # Estimate cost as 40% of revenue (varies by crop)
+    cost_ratio = 0.5 if crop.water_requirement == "high" else 0.4
+    cost = revenue * cost_ratio
+    roi = ((revenue - cost) / cost) * 100 if cost > 0 else 0
+    return round(roi, 1)
+
+
+# ROI estimate per crop; only depends on static crop data
+ROI_TABLE: Dict[str, float] = {name: _estimate_roi(crop) for name, crop in CROP_DATABASE.items()}
+
+# Risk labels attached to crop recommendations
+RISK_HEAT = "Heat stress risk"
+RISK_COLD = "Cold damage risk"
+RISK_DROUGHT = "Drought stress - irrigation required"
+RISK_WATERLOG = "Waterlogging risk"
+RISK_KOLEROGA = "Koleroga (Fruit Rot) disease risk"
+RISK_BLIGHT = "Fungal disease risk (Late Blight)"
+RISK_PEST = "Pest infestation risk"
+
+
+class RiskKind(IntEnum):
+    """Crop risk categories; index into RISK_LABELS and RISK_MITIGATIONS."""
+    HEAT = 0
+    COLD = 1
+    DROUGHT = 2
+    WATERLOG = 3
+    KOLEROGA = 4
+    BLIGHT = 5
+    PEST = 6
+
+
+RISK_LABELS: Tuple[str, ...] = (
+    RISK_HEAT, RISK_COLD, RISK_DROUGHT, RISK_WATERLOG, RISK_KOLEROGA, RISK_BLIGHT, RISK_PEST
+)
+
+# Mitigation advice per risk (indexed by RiskKind)
+RISK_MITIGATIONS: Tuple[str, ...] = (
+    "Install shade nets; increase irrigation frequency; apply mulch",
+    "Use frost covers; apply potassium fertilizer to strengthen plants",
+    "Set up drip irrigation; apply organic mulch; consider drought-resistant varieties",
+    "Dig drainage trenches; create raised beds; avoid planting in low-lying areas",
+    "Apply Bordeaux mixture before monsoon; ensure proper tree spacing; remove infected parts",
+    "Apply copper-based fungicides; ensure plant spacing; avoid overhead irrigation",
+    "Implement integrated pest management; use pheromone traps; encourage natural predators",
+)
+
+# Disease risk flagged for susceptible crops under high humidity
+DISEASE_RISK_BY_CROP: Dict[str, str] = {
+    **dict.fromkeys(["Arecanut", "Coconut", "Black Pepper"], RISK_KOLEROGA),
+    **dict.fromkeys(["Tomato", "Potato", "Chilli"], RISK_BLIGHT),
+}
+
+# Climate requirement ranges used by the vectorized feasibility scoring
+TEMP_MIN = np.array([c.min_temp for c in CROP_DATABASE.values()], dtype=np.float64)
+TEMP_MAX = np.array([c.max_temp for c in CROP_DATABASE.values()], dtype=np.float64)
+HUM_MIN = np.array([c.min_humidity for c in CROP_DATABASE.values()], dtype=np.float64)
+HUM_MAX = np.array([c.max_humidity for c in CROP_DATABASE.values()], dtype=np.float64)
+RAIN_MIN = np.array([c.min_rainfall for c in CROP_DATABASE.values()], dtype=np.float64)
+RAIN_MAX = np.array([c.max_rainfall for c in CROP_DATABASE.values()], dtype=np.float64)
+
+# Waterlogging threshold and disease susceptibility, for the vectorized risk flags
+WATERLOG_RAIN = RAIN_MAX * 1.2
+DISEASE_PRONE = np.array([name in DISEASE_RISK_BY_CROP for name in CROP_NAMES])
+
+
+# Partial soil matches: base soil -> similar soils that earn partial credit
+SIMILAR_SOILS = {
+    "Loamy": ["Alluvial", "Sandy Loam"],
+    "Clay": ["Black (Regur)"],
+    "Sandy": ["Sandy Loam", "Desert"],
+    "Mountain": ["Laterite", "Red"]
+}
+
+
+def _soil_score(crop: CropRequirements, soil_type: str) -> float:
+    """Soil component (max 25) of the feasibility score."""
+    if soil_type in crop.suitable_soils:
+        return 25
+    
+    # Partial match for similar soils
+    similars = SIMILAR_SOILS.get(soil_type)
+    if similars and any(s in crop.suitable_soils for s in similars):
+        return 18
+    return 10  # Default partial
+
+
+# Soil component for every crop (indexed like CROP_NAMES), per known soil
+# type. Any other soil scores the default 10 for every crop.
+ALL_SOIL_TYPES = sorted(
+    {soil for crop in CROP_DATABASE.values() for soil in crop.suitable_soils} | SIMILAR_SOILS.keys()
+)
+SOIL_SCORE_TABLE: Dict[str, np.ndarray] = {
+    soil: np.array([_soil_score(crop, soil) for crop in CROP_DATABASE.values()], dtype=np.float64)
+    for soil in ALL_SOIL_TYPES
+}
+_DEFAULT_SOIL_SCORES = np.full(len(CROP_DATABASE), 10, dtype=np.float64)
+
+
+# Soils that drain poorly (waterlogging risk under heavy rain)
+HEAVY_SOILS = frozenset({"Clay", "Black (Regur)"})
+
+
+def _raw_scores(avg_temp, avg_humidity, annual_rainfall, soil_scores) -> np.ndarray:
+    """
+    Unrounded feasibility scores against the requirement arrays.
+    
+    Conditions may be scalars or (M, 1) columns; the result broadcasts to
+    (N_crops,) or (M, N_crops) accordingly.
+    """
+    # Distance outside the [min, max] range (0 when inside)
+    temp_diff = np.maximum(TEMP_MIN - avg_temp, 0) + np.maximum(avg_temp - TEMP_MAX, 0)
+    temp_score = np.maximum(0, 30 - (temp_diff * 3))
+    
+    hum_diff = np.maximum(HUM_MIN - avg_humidity, 0) + np.maximum(avg_humidity - HUM_MAX, 0)
+    hum_score = np.maximum(0, 20 - (hum_diff * 0.5))
+    
+    rain_score = np.where(
+        annual_rainfall < RAIN_MIN,
+        25 * (annual_rainfall / RAIN_MIN),
+        np.where(
+            annual_rainfall > RAIN_MAX,
+            np.maximum(0, 25 - ((annual_rainfall - RAIN_MAX) / 100)),
+            25
+        )
+    )
+    
+    return temp_score + hum_score + rain_score + soil_scores
+
+
+@dataclass(frozen=True, slots=True)
+class ScanContext:
+    """
+    Scan conditions shared by the crop engine and the risk predictor.
+    
+    Built once per scan so soil-derived features are resolved a single
+    time instead of separately by each service.
+    """
+    temp: float
+    humidity: float
+    rainfall: float
+    soil_type: str
+    budget: Optional[float]
+    soil_scores: np.ndarray  # Soil score per crop (indexed like CROP_NAMES)
+    heavy_soil: bool
+    
+    @classmethod
+    def build(
+        cls,
+        temp: float,
+        humidity: float,
+        rainfall: float,
+        soil_type: str,
+        budget: Optional[float] = None
+    ) -> "ScanContext":
+        """Create a context, deriving the soil features from soil_type."""
+        return cls(
+            temp=temp,
+            humidity=humidity,
+            rainfall=rainfall,
+            soil_type=soil_type,
+            budget=budget,
+            soil_scores=SOIL_SCORE_TABLE.get(soil_type, _DEFAULT_SOIL_SCORES),
+            heavy_soil=soil_type in HEAVY_SOILS
+        )
+
+
 class CropFeasibilityEngine:
     """
     Calculates crop feasibility scores based on environmental conditions.
     """
     
-    def __init__(self):
-        self.crops = CROP_DATABASE
+    crops = CROP_DATABASE
     
     def calculate_feasibility(
         self,
@@ -340,25 +542,83 @@ class CropFeasibilityEngine:
         score += rain_score
         
         # Soil score (25%)
-        if soil_type in crop.suitable_soils:
-            soil_score = 25
-        else:
-            # Partial match for similar soils
-            similar_mappings = {
-                "Loamy": ["Alluvial", "Sandy Loam"],
-                "Clay": ["Black (Regur)"],
-                "Sandy": ["Sandy Loam", "Desert"],
-                "Mountain": ["Laterite", "Red"]
-            }
-            soil_score = 10  # Default partial
-            for base, similars in similar_mappings.items():
-                if soil_type == base and any(s in crop.suitable_soils for s in similars):
-                    soil_score = 18
-                    break
-        score += soil_score
+        score += _soil_score(crop, soil_type)
         
         return round(score, 1)
     
+    def calculate_feasibility_batch(
+        self,
+        avg_temp: float,
+        avg_humidity: float,
+        annual_rainfall: float,
+        soil_type: str
+    ) -> np.ndarray:
+        """
+        Calculate feasibility scores (0-100) for every crop in one pass.
+        
+        Same scoring as calculate_feasibility, evaluated over the
+        requirement arrays instead of crop by crop.
+        
+        Returns:
+            Score vector indexed like CROP_NAMES
+        """
+        return self._score_all(ScanContext.build(avg_temp, avg_humidity, annual_rainfall, soil_type))
+    
+    def get_recommendations_batch(
+        self,
+        avg_temp: np.ndarray,
+        avg_humidity: np.ndarray,
+        annual_rainfall: np.ndarray,
+        soil_types: np.ndarray,
+        top_n: int = 5
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rank crops for many locations (e.g. field cells) at once.
+        
+        Args:
+            avg_temp: Average temperature (°C) per location
+            avg_humidity: Average humidity (%) per location
+            annual_rainfall: Annual rainfall (mm) per location
+            soil_types: Soil type string per location
+            top_n: Number of crops to keep per location
+            
+        Returns:
+            (M, top_n) crop indices (into CROP_NAMES) and matching scores,
+            ordered the same way as get_recommendations (top_n is capped at
+            the number of crops)
+            
+        Raises:
+            ValueError: If the inputs are not 1-D sequences of equal length
+        """
+        # Scalars count as a single location
+        avg_temp = np.atleast_1d(np.asarray(avg_temp, dtype=np.float64))
+        avg_humidity = np.atleast_1d(np.asarray(avg_humidity, dtype=np.float64))
+        annual_rainfall = np.atleast_1d(np.asarray(annual_rainfall, dtype=np.float64))
+        soil_types = np.atleast_1d(np.asarray(soil_types, dtype=str))
+        
+        columns = (avg_temp, avg_humidity, annual_rainfall, soil_types)
+        if any(c.ndim != 1 for c in columns) or len({len(c) for c in columns}) != 1:
+            raise ValueError("Batch inputs must be 1-D sequences of equal length")
+        
+        if len(avg_temp) == 0:
+            width = min(top_n, len(CROP_LIST))
+            return np.empty((0, width), dtype=np.intp), np.empty((0, width))
+        
+        avg_temp = avg_temp[:, None]
+        avg_humidity = avg_humidity[:, None]
+        annual_rainfall = annual_rainfall[:, None]
+        
+        # Resolve each distinct soil once, then expand to one row per location
+        soils, soil_idx = np.unique(soil_types, return_inverse=True)
+        soil_rows = np.stack([SOIL_SCORE_TABLE.get(soil, _DEFAULT_SOIL_SCORES) for soil in soils.tolist()])
+        soil_scores = np.take(soil_rows, soil_idx.ravel(), axis=0)
+        
+        score = _raw_scores(avg_temp, avg_humidity, annual_rainfall, soil_scores)
+        scores = np.array([round(x, 1) for x in score.ravel().tolist()]).reshape(score.shape)
+        
+        top_idx = np.argsort(-scores, axis=1, kind="stable")[:, :top_n]
+        return top_idx, np.take_along_axis(scores, top_idx, axis=1)
+    
     def get_recommendations(
         self,
         avg_temp: float,
@@ -382,72 +642,114 @@ class CropFeasibilityEngine:
         Returns:
             List of CropFeasibility objects sorted by score
         """
-        recommendations = []
+        ctx = ScanContext.build(avg_temp, avg_humidity, annual_rainfall, soil_type, budget)
+        return self.recommend(ctx, top_n)
+    
+    def recommend(self, ctx: ScanContext, top_n: int = 5) -> List[CropFeasibility]:
+        """
+        Get top crop recommendations for a prepared scan context.
+        
+        Conditions are quantized (see _quantize_conditions) before lookup,
+        so readings that differ by less than a bucket share one cached
+        result and are scored at the bucket value.
         
-        for crop_name, crop in self.crops.items():
-            score = self.calculate_feasibility(
-                crop, avg_temp, avg_humidity, annual_rainfall, soil_type
-            )
+        Args:
+            ctx: Scan conditions (see ScanContext.build)
+            top_n: Number of recommendations to return
             
-            # Calculate ROI
-            revenue = crop.yield_per_acre * crop.market_price_per_kg
-            # Estimate cost as 40% of revenue (varies by crop)
-            cost_ratio = 0.5 if crop.water_requirement == "high" else 0.4
-            cost = revenue * cost_ratio
-            roi = ((revenue - cost) / cost) * 100 if cost > 0 else 0
+        Returns:
+            List of CropFeasibility objects sorted by score
+        """
+        temp, humidity, rainfall = _quantize_conditions(ctx.temp, ctx.humidity, ctx.rainfall)
+        return list(_cached_recommendations(temp, humidity, rainfall, ctx.soil_type, top_n))
+    
+    def invalidate(self) -> None:
+        """
+        Clear the recommendation memo.
+        
+        Only the memo is reset: the crop tables it scores from (CROP_LIST,
+        the requirement arrays, SOIL_SCORE_TABLE, ...) are built once at
+        import, so catalog changes still need a restart.
+        """
+        _cached_recommendations.cache_clear()
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counters and size of the recommendation cache."""
+        info = _cached_recommendations.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize
+        }
+    
+    def _rank(self, ctx: ScanContext, top_n: int) -> List[CropFeasibility]:
+        """Score all crops and build response models for the top_n."""
+        scores = self._score_all(ctx)
+        
+        # Stable sort keeps database order for tied scores (same as list.sort)
+        top_idx = np.argsort(-scores, kind="stable")[:top_n]
+        
+        # Risk flags for every crop; label lists are built for the winners only
+        heat, cold, drought, waterlog, disease = self._risk_flags(ctx)
+        
+        # Only the winners are turned into response models
+        recommendations = []
+        for i in top_idx.tolist():
+            crop_name = CROP_NAMES[i]
+            crop = CROP_LIST[i]
             
-            # Identify risks
-            risks = self._identify_risks(crop, avg_temp, avg_humidity, annual_rainfall)
+            risks = []
+            if heat[i]:
+                risks.append(RISK_HEAT)
+            if cold[i]:
+                risks.append(RISK_COLD)
+            if drought[i]:
+                risks.append(RISK_DROUGHT)
+            if waterlog[i]:
+                risks.append(RISK_WATERLOG)
+            if disease[i]:
+                risks.append(DISEASE_RISK_BY_CROP[crop_name])
             
             recommendations.append(CropFeasibility(
                 crop_name=crop_name,
-                feasibility_score=score,
-                roi_estimate=round(roi, 1),
+                feasibility_score=float(scores[i]),
+                roi_estimate=ROI_TABLE[crop_name],
                 growing_season=crop.growing_season,
-                requirements={
-                    "temp_range": f"{crop.min_temp}-{crop.max_temp}°C",
-                    "rainfall": f"{crop.min_rainfall}-{crop.max_rainfall}mm",
-                    "water_need": crop.water_requirement,
-                    "growing_days": crop.growing_days
-                },
+                requirements=CROP_REQUIREMENTS[crop_name],
                 risks=risks
             ))
         
-        # Sort by feasibility score
-        recommendations.sort(key=lambda x: x.feasibility_score, reverse=True)
-        
-        return recommendations[:top_n]
+        return recommendations
     
-    def _identify_risks(
-        self,
-        crop: CropRequirements,
-        temp: float,
-        humidity: float,
-        rainfall: float
-    ) -> List[str]:
-        """Identify potential risks for a crop given conditions."""
-        risks = []
-        
-        # Temperature risks
-        if temp > crop.max_temp:
-            risks.append("Heat stress risk")
-        if temp < crop.min_temp:
-            risks.append("Cold damage risk")
+    def _score_all(self, ctx: ScanContext) -> np.ndarray:
+        """
+        Feasibility scores for every crop at once (indexed like CROP_NAMES).
         
-        # Water risks
-        if rainfall < crop.min_rainfall:
-            risks.append("Drought stress - irrigation required")
-        if rainfall > crop.max_rainfall * 1.2:
-            risks.append("Waterlogging risk")
+        Vectorized form of calculate_feasibility over the requirement
+        arrays; the arithmetic is done in the same order so scores match
+        the scalar version exactly.
+        """
+        score = _raw_scores(ctx.temp, ctx.humidity, ctx.rainfall, ctx.soil_scores)
         
-        # Humidity risks
-        if humidity > 85:
-            if crop.name in ["Arecanut", "Coconut", "Black Pepper"]:
-                risks.append("Koleroga (Fruit Rot) disease risk")
-            elif crop.name in ["Tomato", "Potato", "Chilli"]:
-                risks.append("Fungal disease risk (Late Blight)")
+        # Round like the scalar path (Python round, not np.round)
+        return np.array([round(x, 1) for x in score.tolist()])
+    
+    def _risk_flags(self, ctx: ScanContext) -> List[List[bool]]:
+        """
+        Risk flags for every crop (indexed like CROP_NAMES).
         
-        return risks
+        Returns:
+            Heat, cold, drought, waterlogging and disease flag lists
+        """
+        disease = DISEASE_PRONE if ctx.humidity > 85 else np.zeros_like(DISEASE_PRONE)
+        return [
+            (ctx.temp > TEMP_MAX).tolist(),
+            (ctx.temp < TEMP_MIN).tolist(),
+            (ctx.rainfall < RAIN_MIN).tolist(),
+            (ctx.rainfall > WATERLOG_RAIN).tolist(),
+            disease.tolist(),
+        ]
 
 
 class RiskPredictor:
@@ -455,16 +757,6 @@ class RiskPredictor:
     Predicts agricultural challenges and provides mitigation strategies.
     """
     
-    RISK_MITIGATIONS = {
-        "Heat stress risk": "Install shade nets; increase irrigation frequency; apply mulch",
-        "Cold damage risk": "Use frost covers; apply potassium fertilizer to strengthen plants",
-        "Drought stress - irrigation required": "Set up drip irrigation; apply organic mulch; consider drought-resistant varieties",
-        "Waterlogging risk": "Dig drainage trenches; create raised beds; avoid planting in low-lying areas",
-        "Koleroga (Fruit Rot) disease risk": "Apply Bordeaux mixture before monsoon; ensure proper tree spacing; remove infected parts",
-        "Fungal disease risk (Late Blight)": "Apply copper-based fungicides; ensure plant spacing; avoid overhead irrigation",
-        "Pest infestation risk": "Implement integrated pest management; use pheromone traps; encourage natural predators",
-    }
-    
     def get_risk_assessments(
         self,
         crop: str,
@@ -474,6 +766,11 @@ class RiskPredictor:
         rainfall: float
     ) -> List[RiskAssessment]:
         """Generate comprehensive risk assessment."""
+        return self.assess(crop, ScanContext.build(temp, humidity, rainfall, soil_type))
+    
+    def assess(self, crop: str, ctx: ScanContext) -> List[RiskAssessment]:
+        """Generate the risk assessment for a crop from a prepared scan context."""
+        humidity, temp, rainfall = ctx.humidity, ctx.temp, ctx.rainfall
         risks = []
         
         # High humidity + specific crops = disease risk
@@ -483,16 +780,16 @@ class RiskPredictor:
                     risk_type="Disease",
                     probability=75.0,
                     description="High risk of Koleroga (Fruit Rot) due to humidity > 85%",
-                    mitigation=self.RISK_MITIGATIONS["Koleroga (Fruit Rot) disease risk"]
+                    mitigation=RISK_MITIGATIONS[RiskKind.KOLEROGA]
                 ))
         
         # Clay soil + heavy rain = waterlogging
-        if soil_type in ["Clay", "Black (Regur)"] and rainfall > 1500:
+        if ctx.heavy_soil and rainfall > 1500:
             risks.append(RiskAssessment(
                 risk_type="Waterlogging",
                 probability=60.0,
                 description="Clay soil combined with heavy rainfall may cause waterlogging",
-                mitigation=self.RISK_MITIGATIONS["Waterlogging risk"]
+                mitigation=RISK_MITIGATIONS[RiskKind.WATERLOG]
             ))
         
         # High temp = heat stress
@@ -501,7 +798,7 @@ class RiskPredictor:
                 risk_type="Heat Stress",
                 probability=80.0,
                 description="Temperature exceeds 38°C - crop stress likely",
-                mitigation=self.RISK_MITIGATIONS["Heat stress risk"]
+                mitigation=RISK_MITIGATIONS[RiskKind.HEAT]
             ))
         
         # Low rainfall = drought
@@ -510,26 +807,43 @@ class RiskPredictor:
                 risk_type="Drought",
                 probability=70.0,
                 description="Annual rainfall below 600mm - irrigation critical",
-                mitigation=self.RISK_MITIGATIONS["Drought stress - irrigation required"]
+                mitigation=RISK_MITIGATIONS[RiskKind.DROUGHT]
             ))
         
         return risks
 
 
-# Singleton instances
-_crop_engine: Optional[CropFeasibilityEngine] = None
-_risk_predictor: Optional[RiskPredictor] = None
+# Singleton instances (stateless, so built at import)
+_crop_engine = CropFeasibilityEngine()
+_risk_predictor = RiskPredictor()
 
 
 def get_crop_engine() -> CropFeasibilityEngine:
-    global _crop_engine
-    if _crop_engine is None:
-        _crop_engine = CropFeasibilityEngine()
     return _crop_engine
 
 
 def get_risk_predictor() -> RiskPredictor:
-    global _risk_predictor
-    if _risk_predictor is None:
-        _risk_predictor = RiskPredictor()
     return _risk_predictor
+
+
+def _quantize_conditions(temp: float, humidity: float, rainfall: float) -> Tuple[float, float, float]:
+    """Round conditions to 0.5°C, 1% and 10 mm buckets for the recommendation cache."""
+    return round(temp * 2) / 2, float(round(humidity)), float(round(rainfall / 10) * 10)
+
+
+@lru_cache(maxsize=4096)
+def _cached_recommendations(
+    temp: float,
+    humidity: float,
+    rainfall: float,
+    soil_type: str,
+    top_n: int
+) -> Tuple[CropFeasibility, ...]:
+    """
+    Recommendations memoized on the (quantized) scan conditions.
+    
+    The ranking is a pure function of these inputs (budget is not used).
+    The cached models are shared between callers and must not be mutated.
+    """
+    ctx = ScanContext.build(temp, humidity, rainfall, soil_type)
+    return tuple(_crop_engine._rank(ctx, top_n))
@@ -0,0 +1,84 @@
+"""
+Elevation Provider
+==================
+Terrain elevation sampled from local SRTM height tiles.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+import logging
+import math
+
+import numpy as np
+
+logger = logging.getLogger("agri-nexus.elevation")
+
+# SRTM marks missing samples (radar shadow, water) with this value
+SRTM_VOID = -32768
+
+
+class ElevationProvider:
+    """
+    Reads elevation from SRTM .hgt tiles (SRTM1 or SRTM3).
+    
+    Each tile covers one degree and is named after its south-west corner,
+    e.g. N12E076.hgt. Tiles are memory-mapped on first use and the most
+    recent ones are kept open, so a lookup is a single array index.
+    """
+    
+    def __init__(self, data_dir: Optional[str] = None):
+        """
+        Args:
+            data_dir: Directory holding the .hgt files; None disables lookups
+        """
+        self.data_dir = Path(data_dir) if data_dir else None
+        self._tile = lru_cache(maxsize=64)(self._load_tile)
+    
+    @property
+    def available(self) -> bool:
+        return self.data_dir is not None
+    
+    def elevation(self, lat: float, lon: float) -> Optional[float]:
+        """
+        Elevation in metres at the nearest tile sample.
+        
+        Returns:
+            None if there is no tile for the location or the sample is void
+        """
+        if self.data_dir is None:
+            return None
+        
+        tile_lat, tile_lon = math.floor(lat), math.floor(lon)
+        grid = self._tile(tile_lat, tile_lon)
+        if grid is None:
+            return None
+        
+        # Row 0 is the tile's northern edge
+        last = grid.shape[0] - 1
+        row = round((tile_lat + 1 - lat) * last)
+        col = round((lon - tile_lon) * last)
+        value = int(grid[row, col])
+        return None if value == SRTM_VOID else float(value)
+    
+    def _load_tile(self, tile_lat: int, tile_lon: int) -> Optional[np.ndarray]:
+        """Memory-map one tile, or None if it isn't available."""
+        name = "%s%02d%s%03d.hgt" % (
+            "N" if tile_lat >= 0 else "S", abs(tile_lat),
+            "E" if tile_lon >= 0 else "W", abs(tile_lon)
+        )
+        path = self.data_dir / name
+        if not path.is_file():
+            return None
+        
+        try:
+            data = np.memmap(path, dtype=">i2", mode="r")
+        except (OSError, ValueError) as e:
+            logger.error("Could not read elevation tile %s: %s", path, e)
+            return None
+        
+        size = math.isqrt(data.size)
+        if size * size != data.size:
+            logger.error("Elevation tile %s is not a square grid", path)
+            return None
+        return data.reshape(size, size)
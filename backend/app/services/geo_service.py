@@ -4,16 +4,71 @@ Geo-Intelligence Service
 Location-based analysis including geocoding, topography, and regional data.
 """
 
-from typing import Optional, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Optional, Tuple
+from geopy.adapters import AioHTTPAdapter
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+from geopy.extra.rate_limiter import AsyncRateLimiter
+import aiohttp
+import asyncio
 import logging
 import math
+import re
 
+import numpy as np
+
+from app.core.config import settings
 from app.models.schemas import GeoLookupResponse
+from app.services.elevation import ElevationProvider
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger("agri-nexus.geo")
 
+# Nominatim throttling (usage policy: at most one request per second)
+GEOCODE_TIMEOUT = 5  # seconds per attempt
+GEOCODE_MIN_DELAY = 1.0  # seconds between requests
+GEOCODE_MAX_RETRIES = 2
+GEOCODE_ERROR_WAIT = 5.0  # seconds before retrying a failed attempt
+# Worst case for one lookup: every attempt times out, plus the retry waits
+# and one limiter slot
+GEOCODE_BUDGET = (
+    (GEOCODE_MAX_RETRIES + 1) * GEOCODE_TIMEOUT
+    + GEOCODE_MAX_RETRIES * GEOCODE_ERROR_WAIT
+    + GEOCODE_MIN_DELAY
+)
+ELEVATION_API_TIMEOUT = 5  # seconds
+COORD_PRECISION = 3  # ~100 m; nearby points share one lookup
+
+
+# Mock elevation based on known regions in India:
+# name -> (lat_min, lat_max, lon_min, lon_max, elevation_m)
+ELEVATION_REGIONS = {
+    # Coastal regions (low elevation)
+    "coastal_karnataka": (12.5, 15.5, 74, 75.5, 50),
+    "kerala_coast": (8, 12, 75.5, 77, 30),
+    "goa": (14.8, 15.8, 73.5, 74.5, 20),
+    
+    # Western Ghats (high elevation)
+    "western_ghats_south": (10, 14, 75, 77, 800),
+    "western_ghats_north": (14, 17, 73.5, 75, 600),
+    
+    # Deccan Plateau
+    "deccan_plateau": (15, 20, 74, 79, 450),
+    
+    # North India Plains
+    "indo_gangetic": (25, 30, 75, 88, 100),
+    
+    # Himalayas
+    "himalaya_foothills": (28, 32, 76, 80, 1200),
+}
+
+# Region bounds as parallel arrays, in table order (first match wins)
+_REGION_LAT_MIN, _REGION_LAT_MAX, _REGION_LON_MIN, _REGION_LON_MAX, _REGION_ELEV = (
+    np.array(column, dtype=np.float64) for column in zip(*ELEVATION_REGIONS.values())
+)
+
 
 class GeoService:
     """
@@ -28,11 +83,104 @@ class GeoService:
     
     def __init__(self):
         """Initialize the geocoder with a user agent."""
-        self.geocoder = Nominatim(
+        self._set_geocoder(self._create_geocoder())
+        self._elevation = ElevationProvider(settings.SRTM_DATA_DIR)
+        self._elevation_api_url = settings.ELEVATION_API_URL
+        self._http: Optional[aiohttp.ClientSession] = None
+        # Places don't move, so resolved locations are kept for a day
+        self._location_cache = TTLCache(maxsize=4096, ttl=86400)
+    
+    @staticmethod
+    def _create_geocoder() -> Nominatim:
+        """
+        Async Nominatim client.
+        
+        The aiohttp session is opened lazily on the first lookup and then
+        reused (keep-alive) until aclose().
+        """
+        return Nominatim(
             user_agent="agri-nexus-digital-twin",
-            timeout=10
+            timeout=GEOCODE_TIMEOUT,
+            adapter_factory=AioHTTPAdapter
+        )
+    
+    def _set_geocoder(self, geocoder: Nominatim) -> None:
+        """
+        Use geocoder for lookups, throttled to Nominatim's usage policy.
+        
+        At most one request per second. Service errors (including HTTP 429
+        and per-attempt timeouts of GEOCODE_TIMEOUT) are retried twice after
+        GEOCODE_ERROR_WAIT; lookup_location allows GEOCODE_BUDGET for all of it.
+        """
+        self.geocoder = geocoder
+        self._reverse = AsyncRateLimiter(
+            geocoder.reverse,
+            min_delay_seconds=GEOCODE_MIN_DELAY,
+            max_retries=GEOCODE_MAX_RETRIES,
+            error_wait_seconds=GEOCODE_ERROR_WAIT,
+            swallow_exceptions=False
         )
     
+    @staticmethod
+    def _cache_key(lat: float, lon: float) -> Tuple[float, float]:
+        return (round(lat, COORD_PRECISION), round(lon, COORD_PRECISION))
+    
+    def clear_cache(self) -> None:
+        """Forget all resolved locations."""
+        self._location_cache.clear()
+    
+    async def aclose(self) -> None:
+        """Close the HTTP sessions (called on application shutdown)."""
+        geocoder = self.geocoder
+        self._set_geocoder(self._create_geocoder())
+        await geocoder.__aexit__(None, None, None)
+        
+        http, self._http = self._http, None
+        if http is not None:
+            await http.close()
+    
+    def _http_session(self) -> aiohttp.ClientSession:
+        """Shared keep-alive session for the elevation API, opened on first use."""
+        if self._http is None:
+            self._http = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=ELEVATION_API_TIMEOUT)
+            )
+        return self._http
+    
+    async def fetch_elevations(self, coords: List[Tuple[float, float]]) -> List[Optional[float]]:
+        """
+        Look up elevations from ELEVATION_API_URL in one batched request.
+        
+        Args:
+            coords: (lat, lon) pairs
+            
+        Returns:
+            Elevation in metres per coordinate; all None if the API is not
+            configured or the request fails
+        """
+        if not self._elevation_api_url or not coords:
+            return [None] * len(coords)
+        
+        locations = "|".join(f"{lat},{lon}" for lat, lon in coords)
+        try:
+            async with self._http_session().get(
+                self._elevation_api_url, params={"locations": locations}
+            ) as resp:
+                resp.raise_for_status()
+                results = (await resp.json())["results"]
+            return [result.get("elevation") for result in results]
+        except (aiohttp.ClientError, asyncio.TimeoutError, KeyError, ValueError) as e:
+            logger.error("Elevation API error: %s", e)
+            return [None] * len(coords)
+    
+    async def _get_elevation(self, lat: float, lon: float) -> float:
+        """Elevation from the API when configured, else the local estimate."""
+        if self._elevation_api_url:
+            measured = (await self.fetch_elevations([(lat, lon)]))[0]
+            if measured is not None:
+                return float(measured)
+        return self._estimate_elevation(lat, lon)
+    
     async def lookup_location(self, lat: float, lon: float) -> GeoLookupResponse:
         """
         Get location information from coordinates.
@@ -44,8 +192,16 @@ class GeoService:
         Returns:
             GeoLookupResponse with city, state, country, elevation
         """
+        cache_key = self._cache_key(lat, lon)
+        cached = self._location_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            location = self.geocoder.reverse(f"{lat}, {lon}", language="en")
+            location = await asyncio.wait_for(
+                self._reverse(f"{lat}, {lon}", language="en"),
+                GEOCODE_BUDGET
+            )
             
             if location:
                 address = location.raw.get("address", {})
@@ -60,64 +216,109 @@ class GeoService:
                 state = address.get("state")
                 country = address.get("country")
                 
-                # Estimate elevation (mock - would use real elevation API)
-                elevation = self._estimate_elevation(lat, lon)
+                elevation = await self._get_elevation(lat, lon)
                 
                 # Determine terrain type
                 terrain = self._analyze_terrain(lat, lon, elevation)
                 
-                return GeoLookupResponse(
+                result = GeoLookupResponse(
                     city=city,
                     state=state,
                     country=country,
                     elevation_meters=elevation,
                     terrain_type=terrain
                 )
-        except (GeocoderTimedOut, GeocoderServiceError) as e:
-            logger.error(f"Geocoding error: {e}")
+                # Failed lookups fall through uncached so they are retried
+                self._location_cache.set(cache_key, result)
+                return result
+        except (GeocoderTimedOut, GeocoderServiceError, asyncio.TimeoutError) as e:
+            logger.error("Geocoding error: %s", e)
         except Exception as e:
-            logger.error(f"Unexpected geo error: {e}")
+            logger.error("Unexpected geo error: %s", e)
         
         return GeoLookupResponse(
             terrain_type="Unknown"
         )
     
+    async def lookup_locations_many(
+        self,
+        coords: List[Tuple[float, float]],
+        concurrency: int = 1
+    ) -> List[GeoLookupResponse]:
+        """
+        Get location information for many coordinates.
+        
+        Coordinates that round to the same cache key are looked up once.
+        
+        Args:
+            coords: (lat, lon) pairs
+            concurrency: Lookups in flight at once. Nominatim allows 1;
+                paid providers (Google, Mapbox) can take 10 or more.
+            
+        Returns:
+            One GeoLookupResponse per input coordinate, in order
+        """
+        keys = [self._cache_key(lat, lon) for lat, lon in coords]
+        unique = {}
+        for key, coord in zip(keys, coords):
+            unique.setdefault(key, coord)
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def lookup_one(lat: float, lon: float) -> GeoLookupResponse:
+            async with semaphore:
+                return await self.lookup_location(lat, lon)
+        
+        results = await asyncio.gather(*(lookup_one(lat, lon) for lat, lon in unique.values()))
+        by_key = dict(zip(unique, results))
+        return [by_key[key] for key in keys]
+    
     def _estimate_elevation(self, lat: float, lon: float) -> float:
         """
         Estimate elevation based on location.
         
-        Note: In production, this would call a real elevation API
-        like Google Elevation or OpenTopoData.
+        Uses SRTM tiles when SRTM_DATA_DIR is configured and covers the
+        point; otherwise falls back to a rough regional estimate.
         """
-        # Mock elevation based on known regions in India
-        elevation_map = {
-            # Coastal regions (low elevation)
-            "coastal_karnataka": (12.5, 15.5, 74, 75.5, 50),
-            "kerala_coast": (8, 12, 75.5, 77, 30),
-            "goa": (14.8, 15.8, 73.5, 74.5, 20),
-            
-            # Western Ghats (high elevation)
-            "western_ghats_south": (10, 14, 75, 77, 800),
-            "western_ghats_north": (14, 17, 73.5, 75, 600),
-            
-            # Deccan Plateau
-            "deccan_plateau": (15, 20, 74, 79, 450),
-            
-            # North India Plains
-            "indo_gangetic": (25, 30, 75, 88, 100),
-            
-            # Himalayas
-            "himalaya_foothills": (28, 32, 76, 80, 1200),
-        }
+        measured = self._elevation.elevation(lat, lon)
+        if measured is not None:
+            return measured
         
-        for region, (lat_min, lat_max, lon_min, lon_max, elev) in elevation_map.items():
-            if lat_min <= lat <= lat_max and lon_min <= lon <= lon_max:
-                # Add some variation
-                return elev + (lat * 10 % 50) - 25
+        inside = (
+            (lat >= _REGION_LAT_MIN) & (lat <= _REGION_LAT_MAX) &
+            (lon >= _REGION_LON_MIN) & (lon <= _REGION_LON_MAX)
+        )
+        if inside.any():
+            # First matching region wins; add some variation
+            return float(_REGION_ELEV[inside.argmax()]) + (lat * 10 % 50) - 25
         
         # Default mid-elevation
         return 300.0
     
+    def _estimate_elevation_batch(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Vectorized _estimate_elevation over arrays of coordinates."""
+        lats = np.asarray(lats, dtype=np.float64)[:, None]
+        lons = np.asarray(lons, dtype=np.float64)[:, None]
+        inside = (
+            (lats >= _REGION_LAT_MIN) & (lats <= _REGION_LAT_MAX) &
+            (lons >= _REGION_LON_MIN) & (lons <= _REGION_LON_MAX)
+        )
+        lats, lons = lats[:, 0], lons[:, 0]
+        estimate = np.where(
+            inside.any(axis=1),
+            _REGION_ELEV[inside.argmax(axis=1)] + (lats * 10 % 50) - 25,
+            300.0
+        )
+        
+        if self._elevation.available:
+            # None (no tile / void sample) becomes NaN and keeps the estimate
+            measured = np.array(
+                [self._elevation.elevation(lat, lon) for lat, lon in zip(lats.tolist(), lons.tolist())],
+                dtype=np.float64
+            )
+            estimate = np.where(np.isnan(measured), estimate, measured)
+        return estimate
+    
     def _analyze_terrain(self, lat: float, lon: float, elevation: float) -> str:
         """
         Analyze terrain type based on location and elevation.
@@ -187,8 +388,8 @@ class SoilTaxonomyService:
     Provides soil type estimation based on region.
     """
     
-    # Regional soil type mapping for India
-    REGIONAL_SOIL_MAP = {
+    # Regional soil type mapping for India (read-only)
+    REGIONAL_SOIL_MAP = MappingProxyType({
         # State-based soil types
         "Punjab": {"primary": "Alluvial", "npk": (280, 22, 210)},
         "Haryana": {"primary": "Alluvial", "npk": (260, 18, 200)},
@@ -202,7 +403,16 @@ class SoilTaxonomyService:
         "West Bengal": {"primary": "Alluvial", "npk": (290, 24, 220)},
         "Uttar Pradesh": {"primary": "Alluvial", "npk": (270, 20, 200)},
         "Madhya Pradesh": {"primary": "Black (Regur)", "npk": (190, 18, 230)},
-    }
+    })
+    
+    # Fallback soil by terrain keyword when the state is unknown
+    TERRAIN_SOIL_DEFAULTS = MappingProxyType({
+        "Coastal": ("Alluvial", (250, 18, 180)),
+        "Plateau": ("Black (Regur)", (200, 20, 240)),
+        "Mountain": ("Mountain", (150, 10, 130)),
+        None: ("Loamy", (200, 15, 170)),
+    })
+    TERRAIN_KEYWORD = re.compile("Coastal|Plateau|Mountain")
     
     # Soil characteristics
     SOIL_PROFILES = {
@@ -260,24 +470,14 @@ class SoilTaxonomyService:
             Complete soil analysis dict
         """
         # Try state-based lookup
-        if state and state in self.REGIONAL_SOIL_MAP:
-            soil_info = self.REGIONAL_SOIL_MAP[state]
+        soil_info = self.REGIONAL_SOIL_MAP.get(state) if state else None
+        if soil_info is not None:
             primary_soil = soil_info["primary"]
             npk = soil_info["npk"]
         else:
             # Default based on terrain
-            if terrain and "Coastal" in terrain:
-                primary_soil = "Alluvial"
-                npk = (250, 18, 180)
-            elif terrain and "Plateau" in terrain:
-                primary_soil = "Black (Regur)"
-                npk = (200, 20, 240)
-            elif terrain and "Mountain" in terrain:
-                primary_soil = "Mountain"
-                npk = (150, 10, 130)
-            else:
-                primary_soil = "Loamy"
-                npk = (200, 15, 170)
+            match = self.TERRAIN_KEYWORD.search(terrain) if terrain else None
+            primary_soil, npk = self.TERRAIN_SOIL_DEFAULTS[match.group(0) if match else None]
         
         # Get profile if available
         profile = self.SOIL_PROFILES.get(primary_soil, {})
@@ -290,49 +490,46 @@ class SoilTaxonomyService:
                 "potassium_kg_ha": npk[2]
             },
             "profile": profile,
-            "recommendation": self._get_soil_recommendation(primary_soil, npk)
+            "recommendation": _soil_recommendation(primary_soil, npk[0] < 200, npk[1] < 15, npk[2] < 150)
         }
-    
-    def _get_soil_recommendation(self, soil_type: str, npk: Tuple[int, int, int]) -> str:
-        """Generate recommendation based on soil analysis."""
-        n, p, k = npk
-        
-        recommendations = []
-        
-        if n < 200:
-            recommendations.append("Apply nitrogen-rich fertilizers (Urea)")
-        if p < 15:
-            recommendations.append("Add phosphorus (DAP or SSP)")
-        if k < 150:
-            recommendations.append("Supplement with potash (MOP)")
-        
-        if soil_type == "Laterite":
-            recommendations.append("Add lime to correct acidity")
-            recommendations.append("Apply organic matter to improve water retention")
-        elif soil_type == "Black (Regur)":
-            recommendations.append("Ensure proper drainage for monsoon")
-            recommendations.append("Avoid over-irrigation")
-        elif soil_type == "Desert":
-            recommendations.append("Focus on drip irrigation")
-            recommendations.append("Add organic matter extensively")
-        
-        return "; ".join(recommendations) if recommendations else "Soil is well-balanced"
 
 
-# Singleton instances
-_geo_service: Optional[GeoService] = None
-_soil_service: Optional[SoilTaxonomyService] = None
+@lru_cache(maxsize=None)
+def _soil_recommendation(soil_type: str, n_low: bool, p_low: bool, k_low: bool) -> str:
+    """
+    Generate recommendation based on soil analysis.
+    
+    Only the soil type and which nutrients are below target matter, so
+    the handful of possible results are memoized.
+    """
+    recommendations = []
+    
+    if n_low:
+        recommendations.append("Apply nitrogen-rich fertilizers (Urea)")
+    if p_low:
+        recommendations.append("Add phosphorus (DAP or SSP)")
+    if k_low:
+        recommendations.append("Supplement with potash (MOP)")
+    
+    if soil_type == "Laterite":
+        recommendations.append("Add lime to correct acidity")
+        recommendations.append("Apply organic matter to improve water retention")
+    elif soil_type == "Black (Regur)":
+        recommendations.append("Ensure proper drainage for monsoon")
+        recommendations.append("Avoid over-irrigation")
+    elif soil_type == "Desert":
+        recommendations.append("Focus on drip irrigation")
+        recommendations.append("Add organic matter extensively")
+    
+    return "; ".join(recommendations) if recommendations else "Soil is well-balanced"
 
 
+# Singleton instances (created on first use)
+@lru_cache(maxsize=1)
 def get_geo_service() -> GeoService:
-    global _geo_service
-    if _geo_service is None:
-        _geo_service = GeoService()
-    return _geo_service
+    return GeoService()
 
 
+@lru_cache(maxsize=1)
 def get_soil_service() -> SoilTaxonomyService:
-    global _soil_service
-    if _soil_service is None:
-        _soil_service = SoilTaxonomyService()
-    return _soil_service
+    return SoilTaxonomyService()
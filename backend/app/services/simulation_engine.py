@@ -15,12 +15,34 @@ The simulation runs in real-time via WebSocket, updating every 2 seconds.
 import math
 import random
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, List, Tuple
 from dataclasses import dataclass, field
+
+import numpy as np
+
 from app.models.schemas import SensorReading, AlertBase, AlertType, AlertSeverity
 
 
-@dataclass
+# Alert bits (see WeatherSimulator._check_alerts) and message templates
+ALERT_DRY, ALERT_STORM, ALERT_HEAT, ALERT_FROST = 1, 2, 4, 8
+DRY_MESSAGE = "Soil moisture has dropped to {}%. Irrigation recommended immediately."
+STORM_MESSAGE = ("Atmospheric pressure at {} hPa indicates "
+                 "potential severe weather. Secure equipment and crops.")
+HEAT_MESSAGE = "Temperature has reached {}°C. Consider shade netting and increased irrigation."
+FROST_MESSAGE = ("Temperature has dropped to {}°C. "
+                 "Frost damage risk is high. Activate frost protection.")
+
+# Angular speed of the daily cycle (radians per virtual hour)
+OMEGA = 2 * math.pi / 24
+
+# Recent ticks kept by WeatherSimulator (one virtual day at the default rate)
+HISTORY_WINDOW = 720
+# Rows of the history buffer
+HISTORY_TEMPERATURE, HISTORY_HUMIDITY, HISTORY_SOIL_MOISTURE = 0, 1, 2
+
+
+@dataclass(frozen=True, slots=True)
 class SimulationConfig:
     """Configuration for the simulation parameters."""
     # Temperature settings
@@ -52,9 +74,19 @@ class SimulationConfig:
     
     # Time scaling
     ticks_per_virtual_hour: int = 30     # How many ticks = 1 virtual hour
+    
+    # Derived in __post_init__: phase offsets so a cycle is sin(hour * OMEGA + offset)
+    temp_phase_offset: float = field(init=False, repr=False)
+    humidity_phase_offset: float = field(init=False, repr=False)
+    hours_per_tick: float = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "temp_phase_offset", (6 - self.peak_hour) * OMEGA)
+        object.__setattr__(self, "humidity_phase_offset", (6 - self.humidity_peak_hour) * OMEGA)
+        object.__setattr__(self, "hours_per_tick", 1.0 / self.ticks_per_virtual_hour)
 
 
-@dataclass
+@dataclass(slots=True)
 class WeatherState:
     """Current state of the weather simulation."""
     # Core readings
@@ -88,20 +120,69 @@ class WeatherSimulator:
     - Rainfall probability based on atmospheric conditions
     """
     
-    def __init__(self, config: Optional[SimulationConfig] = None):
-        """Initialize the simulator with optional custom config."""
+    def __init__(self, config: Optional[SimulationConfig] = None, seed: Optional[int] = None):
+        """Initialize the simulator with optional custom config and random seed."""
         self.config = config or SimulationConfig()
         self.state = WeatherState()
+        # Own generator: no shared global state, reproducible when seeded
+        self._rng = random.Random(seed)
         self._alerts: List[AlertBase] = []
         
         # Pressure trend direction (slowly drifts)
         self._pressure_trend: float = 0.0
+        
+        # Ring buffer of recent ticks, one row per variable (see HISTORY_*).
+        # float32 keeps the 2-decimal readings exact when printed back
+        # (7 significant digits) at half the memory of float64.
+        self._history = np.empty((3, HISTORY_WINDOW), dtype=np.float32)
+        self._history_len = 0
+        
+        # Sensor snapshots (numeric + formatted), rebuilt once per state change
+        self._raw_snapshot: dict = {}
+        self._snapshot: dict = {}
+        self._alerts_dumped: Optional[List[dict]] = None
+        self._summary: Optional[dict] = None
+        self._publish_snapshot()
     
     def reset(self):
         """Reset simulation to default state."""
         self.state = WeatherState()
         self._alerts = []
         self._pressure_trend = 0.0
+        self._history_len = 0
+        self._publish_snapshot()
+    
+    def _publish_snapshot(self):
+        """
+        Rebuild the sensor snapshots from the current state.
+        
+        Readers get the dicts by reference, so each is replaced with a single
+        assignment and never mutated after publishing. Also invalidates the
+        lazily built alert list and state summary.
+        """
+        self._alerts_dumped = None
+        self._summary = None
+        state = self.state
+        condition = "Raining" if state.is_raining else ("Hot" if state.temperature > 35 else "Normal")
+        alerts = [alert.message for alert in self._alerts]
+        self._raw_snapshot = {
+            "temperature": state.temperature,
+            "humidity": state.humidity,
+            "soil_moisture": state.soil_moisture,
+            "pressure": state.pressure,
+            "is_raining": state.is_raining,
+            "condition": condition,
+            "alerts": alerts
+        }
+        self._snapshot = {
+            "temperature": f"{state.temperature:.1f}°C",
+            "humidity": f"{state.humidity:.1f}%",
+            "soil_moisture": f"{state.soil_moisture:.1f}%",
+            "pressure": f"{state.pressure:.1f} hPa",
+            "is_raining": state.is_raining,
+            "condition": condition,
+            "alerts": alerts
+        }
     
     def _calculate_diurnal_temperature(self) -> float:
         """
@@ -120,18 +201,16 @@ class WeatherSimulator:
         hour = self.state.virtual_hour
         cfg = self.config
         
-        # Convert hour to radians for sine calculation
-        # Shift by peak_hour to align maximum
-        phase_shift = (hour - cfg.peak_hour + 6) * (2 * math.pi / 24)
-        
+        # Hour in radians, shifted by peak_hour to align maximum
+        # (offset precomputed in SimulationConfig)
         # Sine wave gives value between -1 and 1
-        sine_value = math.sin(phase_shift)
+        sine_value = math.sin(hour * OMEGA + cfg.temp_phase_offset)
         
         # Calculate base temperature from sine wave
         base_temp = cfg.base_temp + cfg.temp_amplitude * sine_value
         
         # Add Gaussian noise for realism
-        noise = random.gauss(0, cfg.temp_noise)
+        noise = self._rng.gauss(0, cfg.temp_noise)
         
         # Rain cools the temperature
         if self.state.is_raining:
@@ -153,8 +232,7 @@ class WeatherSimulator:
         cfg = self.config
         
         # Inverse sine wave (opposite of temperature)
-        phase_shift = (hour - cfg.humidity_peak_hour + 6) * (2 * math.pi / 24)
-        sine_value = -math.sin(phase_shift)  # Negative for inverse
+        sine_value = -math.sin(hour * OMEGA + cfg.humidity_phase_offset)  # Negative for inverse
         
         base_humidity = cfg.base_humidity + cfg.humidity_amplitude * sine_value
         
@@ -164,7 +242,7 @@ class WeatherSimulator:
             base_humidity = min(98, base_humidity + rain_boost)
         
         # Add small noise
-        noise = random.gauss(0, 2.0)
+        noise = self._rng.gauss(0, 2.0)
         
         # Clamp to valid range
         return round(max(20, min(100, base_humidity + noise)), 2)
@@ -179,7 +257,7 @@ class WeatherSimulator:
         cfg = self.config
         
         # Random walk for pressure trend
-        self._pressure_trend += random.gauss(0, 0.5)
+        self._pressure_trend += self._rng.gauss(0, 0.5)
         self._pressure_trend = max(-1, min(1, self._pressure_trend))  # Clamp drift
         
         # Apply trend to pressure
@@ -246,23 +324,27 @@ class WeatherSimulator:
         if self.state.is_raining:
             if self.state.rain_ticks_remaining > 0:
                 # Gradually vary intensity
-                intensity_change = random.gauss(0, 0.1)
+                intensity_change = self._rng.gauss(0, 0.1)
                 new_intensity = self.state.rain_intensity + intensity_change
                 return True, max(0.1, min(1.0, new_intensity))
             else:
                 # Rain ending
                 return False, 0.0
         
-        # Check conditions for starting rain
-        humidity_factor = max(0, (self.state.humidity - cfg.rain_humidity_threshold) / 15)
-        pressure_factor = max(0, (cfg.rain_pressure_threshold - self.state.pressure) / 20)
-        
-        rain_probability = cfg.rain_base_probability + (humidity_factor * 0.1) + (pressure_factor * 0.1)
+        # Check conditions for starting rain. Usually neither threshold is
+        # crossed and only the base probability applies.
+        humidity, pressure = self.state.humidity, self.state.pressure
+        if humidity <= cfg.rain_humidity_threshold and pressure >= cfg.rain_pressure_threshold:
+            rain_probability = cfg.rain_base_probability
+        else:
+            humidity_factor = max(0, (humidity - cfg.rain_humidity_threshold) / 15)
+            pressure_factor = max(0, (cfg.rain_pressure_threshold - pressure) / 20)
+            rain_probability = cfg.rain_base_probability + (humidity_factor * 0.1) + (pressure_factor * 0.1)
         
-        if random.random() < rain_probability:
+        if self._rng.random() < rain_probability:
             # Start raining!
-            duration = random.randint(cfg.rain_duration_min, cfg.rain_duration_max)
-            intensity = random.uniform(0.3, 1.0)
+            duration = self._rng.randint(cfg.rain_duration_min, cfg.rain_duration_max)
+            intensity = self._rng.uniform(0.3, 1.0)
             self.state.rain_ticks_remaining = duration
             return True, intensity
         
@@ -277,55 +359,65 @@ class WeatherSimulator:
         - STORM_WARNING: Pressure < 990 hPa
         - HEAT_WARNING: Temperature > 38°C
         - FROST_WARNING: Temperature < 2°C
+        
+        The thresholds are checked as one bitmask first; on the common
+        all-clear tick the existing empty list is kept. Alert values come
+        from the simulator itself, so models are built without validation.
         """
+        state = self.state
+        mask = (
+            (state.soil_moisture < 30)
+            | (state.pressure < 990) << 1
+            | (state.temperature > 38) << 2
+            | (state.temperature < 2) << 3
+        )
+        if not mask and not self._alerts:
+            return self._alerts
+        
         alerts = []
         
         # Critical Dry Alert
-        if self.state.soil_moisture < 30:
-            alerts.append(AlertBase(
+        if mask & ALERT_DRY:
+            alerts.append(AlertBase.model_construct(
                 type=AlertType.CRITICAL_DRY,
-                severity=AlertSeverity.HIGH if self.state.soil_moisture < 20 else AlertSeverity.MEDIUM,
+                severity=AlertSeverity.HIGH if state.soil_moisture < 20 else AlertSeverity.MEDIUM,
                 title="Critical Soil Moisture Alert",
-                message=f"Soil moisture has dropped to {self.state.soil_moisture}%. "
-                        "Irrigation recommended immediately.",
+                message=DRY_MESSAGE.format(state.soil_moisture),
                 threshold_value=30.0,
-                actual_value=self.state.soil_moisture
+                actual_value=state.soil_moisture
             ))
         
         # Storm Warning
-        if self.state.pressure < 990:
-            alerts.append(AlertBase(
+        if mask & ALERT_STORM:
+            alerts.append(AlertBase.model_construct(
                 type=AlertType.STORM_WARNING,
                 severity=AlertSeverity.HIGH,
                 title="Storm Warning",
-                message=f"Atmospheric pressure at {self.state.pressure} hPa indicates "
-                        "potential severe weather. Secure equipment and crops.",
+                message=STORM_MESSAGE.format(state.pressure),
                 threshold_value=990.0,
-                actual_value=self.state.pressure
+                actual_value=state.pressure
             ))
         
         # Heat Warning
-        if self.state.temperature > 38:
-            alerts.append(AlertBase(
+        if mask & ALERT_HEAT:
+            alerts.append(AlertBase.model_construct(
                 type=AlertType.HEAT_WARNING,
                 severity=AlertSeverity.MEDIUM,
                 title="Heat Wave Alert",
-                message=f"Temperature has reached {self.state.temperature}°C. "
-                        "Consider shade netting and increased irrigation.",
+                message=HEAT_MESSAGE.format(state.temperature),
                 threshold_value=38.0,
-                actual_value=self.state.temperature
+                actual_value=state.temperature
             ))
         
         # Frost Warning
-        if self.state.temperature < 2:
-            alerts.append(AlertBase(
+        if mask & ALERT_FROST:
+            alerts.append(AlertBase.model_construct(
                 type=AlertType.FROST_WARNING,
                 severity=AlertSeverity.CRITICAL,
                 title="Frost Warning",
-                message=f"Temperature has dropped to {self.state.temperature}°C. "
-                        "Frost damage risk is high. Activate frost protection.",
+                message=FROST_MESSAGE.format(state.temperature),
                 threshold_value=2.0,
-                actual_value=self.state.temperature
+                actual_value=state.temperature
             ))
         
         return alerts
@@ -335,7 +427,7 @@ class WeatherSimulator:
         self.state.tick_count += 1
         
         # Advance virtual hour
-        self.state.virtual_hour += 1.0 / self.config.ticks_per_virtual_hour
+        self.state.virtual_hour += self.config.hours_per_tick
         
         # Wrap around at 24 hours
         if self.state.virtual_hour >= 24:
@@ -345,16 +437,60 @@ class WeatherSimulator:
         if self.state.rain_ticks_remaining > 0:
             self.state.rain_ticks_remaining -= 1
     
-    def update_state(self) -> SensorReading:
+    def update_state(self, now: Optional[datetime] = None) -> SensorReading:
         """
         Run one simulation tick and return the new sensor readings.
         
         This is the main method called every tick interval (e.g., 2 seconds).
         It updates all weather parameters based on physics models.
         
+        Args:
+            now: Timestamp for the reading; callers that already took the
+                time for this tick pass it in to avoid another clock read
+        
         Returns:
             SensorReading with current values
         """
+        self._step()
+        self._alerts = self._check_alerts()
+        self._publish_snapshot()
+        return self._reading(now)
+    
+    def update_state_batch(
+        self, n: int, now: Optional[datetime] = None
+    ) -> Tuple[SensorReading, np.ndarray]:
+        """
+        Run n simulation ticks and return the final reading plus the trajectory.
+        
+        Each tick depends on the previous one (clamping, rain state, random
+        walks), so the physics still runs tick by tick; the savings come from
+        skipping the per-tick alert check, snapshot and reading model, which
+        only the final state needs. Given the same seed the states match n
+        calls to update_state().
+        
+        Args:
+            n: Number of ticks to advance (at least 1)
+            now: Timestamp for the final reading
+            
+        Returns:
+            Tuple of (final SensorReading, array of shape (n, 3) holding
+            temperature, humidity and soil moisture after each tick)
+        """
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        
+        trajectory = np.empty((n, 3))
+        state = self.state
+        for i in range(n):
+            self._step()
+            trajectory[i] = (state.temperature, state.humidity, state.soil_moisture)
+        
+        self._alerts = self._check_alerts()
+        self._publish_snapshot()
+        return self._reading(now), trajectory
+    
+    def _step(self):
+        """Advance the physics by one tick without publishing anything."""
         # Check rain conditions first (affects other calculations)
         should_rain, rain_intensity = self._check_rain_conditions()
         self.state.is_raining = should_rain
@@ -368,17 +504,41 @@ class WeatherSimulator:
         self.state.soil_moisture = self._calculate_soil_moisture()
         
         # Update wind (simple random walk)
-        self.state.wind_speed = max(0, self.state.wind_speed + random.gauss(0, 1))
+        self.state.wind_speed = max(0, self.state.wind_speed + self._rng.gauss(0, 1))
         self.state.wind_speed = min(50, self.state.wind_speed)
         
-        # Check for alerts
-        self._alerts = self._check_alerts()
+        # Record before advancing, so the slot is the index of this tick
+        state = self.state
+        self._history[:, state.tick_count % HISTORY_WINDOW] = (
+            state.temperature, state.humidity, state.soil_moisture
+        )
+        self._history_len = min(self._history_len + 1, HISTORY_WINDOW)
         
         # Advance time
         self._advance_time()
+    
+    def get_history(self, n: Optional[int] = None) -> np.ndarray:
+        """
+        Get the most recent ticks in chronological order.
         
-        # Return sensor reading
-        return SensorReading(
+        Args:
+            n: Number of ticks to return (default: everything kept, at most
+                HISTORY_WINDOW)
+            
+        Returns:
+            float32 array of shape (3, n) with rows HISTORY_TEMPERATURE,
+            HISTORY_HUMIDITY and HISTORY_SOIL_MOISTURE
+        """
+        count = self._history_len if n is None else max(0, min(n, self._history_len))
+        end = self.state.tick_count
+        # Fancy indexing yields a Fortran-ordered copy; rows must be contiguous
+        return np.ascontiguousarray(self._history[:, np.arange(end - count, end) % HISTORY_WINDOW])
+    
+    def _reading(self, now: Optional[datetime]) -> SensorReading:
+        """Build the SensorReading for the current state."""
+        # The values come straight from the simulator
+        # and are already clamped, so skip Pydantic validation on this path.
+        return SensorReading.model_construct(
             temperature=self.state.temperature,
             humidity=self.state.humidity,
             pressure=self.state.pressure,
@@ -387,13 +547,41 @@ class WeatherSimulator:
             wind_speed=round(self.state.wind_speed, 2),
             is_raining=self.state.is_raining,
             simulation_tick=self.state.tick_count,
-            timestamp=datetime.now()
+            timestamp=now or datetime.now()
         )
     
     def get_alerts(self) -> List[AlertBase]:
         """Get current active alerts."""
         return self._alerts
     
+    def get_alerts_dumped(self) -> List[dict]:
+        """
+        Get the current alerts as dicts (``model_dump()`` of each alert).
+        
+        Built on first use after a state change and reused until the next
+        one. The list is shared between callers and must be treated as
+        read-only.
+        """
+        if self._alerts_dumped is None:
+            self._alerts_dumped = [alert.model_dump() for alert in self._alerts]
+        return self._alerts_dumped
+    
+    def get_sensor_snapshot(self) -> dict:
+        """
+        Get the formatted sensor snapshot for the current state.
+        
+        The dict is shared between callers and must be treated as read-only.
+        """
+        return self._snapshot
+    
+    def get_raw_snapshot(self) -> dict:
+        """
+        Get the numeric (unformatted) sensor snapshot for the current state.
+        
+        The dict is shared between callers and must be treated as read-only.
+        """
+        return self._raw_snapshot
+    
     def trigger_rain(self, intensity: float = 0.8, duration: int = 30):
         """
         Manually trigger a rain event (for demo/testing).
@@ -407,6 +595,7 @@ class WeatherSimulator:
         self.state.rain_ticks_remaining = duration
         self.state.humidity = min(98, self.state.humidity + 20)
         self.state.temperature -= 3  # Rain cools things down
+        self._publish_snapshot()
     
     def trigger_drought(self):
         """Manually trigger drought conditions (for demo/testing)."""
@@ -415,12 +604,30 @@ class WeatherSimulator:
         self.state.is_raining = False
         self.state.rain_intensity = 0.0
         self.state.rain_ticks_remaining = 0
+        self._publish_snapshot()
+    
+    def get_virtual_time(self) -> str:
+        """Virtual clock as HH:MM."""
+        hours, minutes = divmod(int(self.state.virtual_hour * 60), 60)
+        return f"{hours:02d}:{minutes:02d}"
     
     def get_state_summary(self) -> dict:
-        """Get a summary of the current simulation state."""
+        """
+        Get a summary of the current simulation state.
+        
+        Built on first use after a state change and reused until the next
+        one. The dict is shared between callers and must be treated as
+        read-only.
+        """
+        if self._summary is None:
+            self._summary = self._build_state_summary()
+        return self._summary
+    
+    def _build_state_summary(self) -> dict:
+        """Format the state summary dict."""
         return {
             "tick": self.state.tick_count,
-            "virtual_time": f"{int(self.state.virtual_hour):02d}:{int((self.state.virtual_hour % 1) * 60):02d}",
+            "virtual_time": self.get_virtual_time(),
             "temperature": f"{self.state.temperature}°C",
             "humidity": f"{self.state.humidity}%",
             "pressure": f"{self.state.pressure} hPa",
@@ -431,13 +638,134 @@ class WeatherSimulator:
         }
 
 
-# Singleton instance for the WebSocket handler
-_simulator_instance: Optional[WeatherSimulator] = None
+class VectorWeatherSimulator:
+    """
+    Runs the WeatherSimulator physics for many fields at once.
+    
+    Each field has its own weather state, held as NumPy arrays with one
+    element per field; step() advances every field by one tick with a
+    handful of array operations instead of a Python loop per field.
+    All fields share the virtual clock. Alerts and snapshots are not
+    tracked here - use WeatherSimulator for a single live farm.
+    """
+    
+    def __init__(
+        self,
+        n_fields: int,
+        config: Optional[SimulationConfig] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            n_fields: Number of fields to simulate
+            config: Simulation parameters shared by all fields
+            seed: Seed for the random generator (for reproducible runs)
+        """
+        self.n_fields = n_fields
+        self.config = config or SimulationConfig()
+        self._rng = np.random.default_rng(seed)
+        self.reset()
+    
+    def reset(self):
+        """Reset every field to the default WeatherState."""
+        n = self.n_fields
+        defaults = WeatherState()
+        self.temperature = np.full(n, defaults.temperature)
+        self.humidity = np.full(n, defaults.humidity)
+        self.pressure = np.full(n, defaults.pressure)
+        self.soil_moisture = np.full(n, defaults.soil_moisture)
+        self.rainfall = np.zeros(n)
+        self.is_raining = np.zeros(n, dtype=bool)
+        self.rain_intensity = np.zeros(n)
+        self.rain_ticks_remaining = np.zeros(n, dtype=np.int64)
+        self.wind_speed = np.full(n, defaults.wind_speed)
+        self._pressure_trend = np.zeros(n)
+        self.tick_count = defaults.tick_count
+        self.virtual_hour = defaults.virtual_hour
+    
+    def step(self):
+        """Run one simulation tick for all fields (same model as WeatherSimulator.update_state)."""
+        cfg = self.config
+        rng = self._rng
+        n = self.n_fields
+        
+        # Rain: ongoing events continue with drifting intensity, others may start
+        continuing = self.is_raining & (self.rain_ticks_remaining > 0)
+        humidity_factor = np.maximum(0, (self.humidity - cfg.rain_humidity_threshold) / 15)
+        pressure_factor = np.maximum(0, (cfg.rain_pressure_threshold - self.pressure) / 20)
+        rain_probability = cfg.rain_base_probability + (humidity_factor * 0.1) + (pressure_factor * 0.1)
+        starting = ~self.is_raining & (rng.random(n) < rain_probability)
+        
+        self.rain_ticks_remaining = np.where(
+            starting,
+            rng.integers(cfg.rain_duration_min, cfg.rain_duration_max, size=n, endpoint=True),
+            self.rain_ticks_remaining
+        )
+        intensity = np.where(
+            continuing,
+            np.clip(self.rain_intensity + rng.normal(0, 0.1, n), 0.1, 1.0),
+            np.where(starting, rng.uniform(0.3, 1.0, n), 0.0)
+        )
+        raining = continuing | starting
+        self.is_raining = raining
+        self.rain_intensity = intensity
+        self.rainfall = np.where(raining, intensity * 2.5, 0.0)
+        
+        # Diurnal cycles are shared by all fields; rain and noise are per field
+        hour = self.virtual_hour
+        base_temp = cfg.base_temp + cfg.temp_amplitude * math.sin(hour * OMEGA + cfg.temp_phase_offset)
+        temperature = base_temp - np.where(raining, intensity * 5.0, 0.0) + rng.normal(0, cfg.temp_noise, n)
+        self.temperature = np.round(temperature, 2)
+        
+        base_humidity = cfg.base_humidity - cfg.humidity_amplitude * math.sin(hour * OMEGA + cfg.humidity_phase_offset)
+        humidity = np.where(raining, np.minimum(98, base_humidity + intensity * 20.0), base_humidity)
+        self.humidity = np.round(np.clip(humidity + rng.normal(0, 2.0, n), 20, 100), 2)
+        
+        # Pressure: clamped random-walk trend with a pull back to baseline
+        self._pressure_trend = np.clip(self._pressure_trend + rng.normal(0, 0.5, n), -1, 1)
+        pressure = self.pressure + self._pressure_trend * 0.1
+        pressure -= np.sign(pressure - cfg.base_pressure) * 0.05
+        self.pressure = np.round(np.clip(
+            pressure,
+            cfg.base_pressure - cfg.pressure_drift_range,
+            cfg.base_pressure + cfg.pressure_drift_range
+        ), 2)
+        
+        # Soil moisture: rain recharges, otherwise decay plus heat evaporation
+        drying = self.soil_moisture * cfg.decay_rate - np.maximum(self.temperature - 30, 0) * cfg.evaporation_factor
+        moisture = np.where(
+            raining,
+            np.minimum(cfg.rain_moisture_spike, self.soil_moisture + intensity * 5.0),
+            drying
+        )
+        self.soil_moisture = np.round(np.clip(moisture, 0, 100), 2)
+        
+        self.wind_speed = np.clip(self.wind_speed + rng.normal(0, 1, n), 0, 50)
+        
+        # Advance the shared clock and count down rain events
+        self.tick_count += 1
+        self.virtual_hour += cfg.hours_per_tick
+        if self.virtual_hour >= 24:
+            self.virtual_hour = 0.0
+        self.rain_ticks_remaining = np.maximum(self.rain_ticks_remaining - 1, 0)
+    
+    def reading(self, index: int, now: Optional[datetime] = None) -> SensorReading:
+        """Sensor reading for one field."""
+        return SensorReading.model_construct(
+            temperature=float(self.temperature[index]),
+            humidity=float(self.humidity[index]),
+            pressure=float(self.pressure[index]),
+            soil_moisture=float(self.soil_moisture[index]),
+            rainfall=round(float(self.rainfall[index]), 2),
+            wind_speed=round(float(self.wind_speed[index]), 2),
+            is_raining=bool(self.is_raining[index]),
+            simulation_tick=self.tick_count,
+            timestamp=now or datetime.now()
+        )
 
 
+# Singleton instance for the WebSocket handler
+@lru_cache(maxsize=1)
 def get_simulator() -> WeatherSimulator:
     """Get or create the singleton simulator instance."""
-    global _simulator_instance
-    if _simulator_instance is None:
-        _simulator_instance = WeatherSimulator()
-    return _simulator_instance
+    return WeatherSimulator()
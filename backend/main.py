@@ -11,19 +11,43 @@ It handles:
 - Weather prediction models
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+import asyncio
+import atexit
 import logging
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+import queue
+
+import orjson
+
+from app.core.responses import ORJSONResponse
+
+# Configure logging. Handlers only enqueue records; a listener thread does
+# the formatting and stream writes so the event loop never blocks on I/O.
+_log_queue = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+_log_listener = QueueListener(_log_queue, _log_stream)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # flush queued records on exit
+_log_enqueue = QueueHandler(_log_queue)
+# Only merge args into the message here; the listener applies the real format
+_log_enqueue.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=logging.INFO, handlers=[_log_enqueue])
 logger = logging.getLogger("agri-nexus")
 
 
+def _log_ticker_exit(task: asyncio.Task):
+    """Report a sensor ticker that stopped with an error (cancellation is normal)."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Sensor ticker stopped", exc_info=task.exception())
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup/shutdown events."""
@@ -31,9 +55,21 @@ async def lifespan(app: FastAPI):
     logger.info("🌱 Agri-Nexus Backend Starting...")
     logger.info("🔬 Initializing Digital Twin Simulation Engine...")
     logger.info("🤖 Loading AI Models...")
+    from app.routers.chat import get_gemini_model
+    get_gemini_model()
+    from app.routers.research import warm_fixtures
+    warm_fixtures()
+    from app.routers.sensors import sensor_ticker
+    ticker = asyncio.create_task(sensor_ticker())
+    ticker.add_done_callback(_log_ticker_exit)
     yield
     # Shutdown
     logger.info("🛑 Agri-Nexus Backend Shutting Down...")
+    ticker.cancel()
+    with suppress(asyncio.CancelledError):
+        await ticker
+    from app.services.geo_service import get_geo_service
+    await get_geo_service().aclose()
 
 
 # Initialize FastAPI application
@@ -43,24 +79,58 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# CORS Configuration - Allow frontend to connect
+# CORS Configuration - Allow frontend to connect.
+# allow_origins only matches exact strings, so the Vercel/Render preview
+# subdomains go through allow_origin_regex (compiled once by Starlette).
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
         "http://localhost:3000",      # Next.js dev server
         "http://127.0.0.1:3000",
-        "https://*.vercel.app",       # Vercel deployments
-        "https://*.onrender.com",     # Render.com deployments
-        "https://agri-nexus-frontend.onrender.com",  # Specific frontend
     ],
+    # Vercel and Render.com deployments (incl. agri-nexus-frontend.onrender.com)
+    allow_origin_regex=r"https://[a-z0-9-]+\.(vercel\.app|onrender\.com)",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies (scan results, crop lists). Streamed NDJSON
+# scans are excluded: gzip would hold sections back until the stream ends.
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=500,
+    compresslevel=4,
+    exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES + ("application/x-ndjson",)
+)
+
+
+# Static bodies are encoded once; load balancers poll /api/health constantly
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "agri-nexus-api",
+    "version": "1.0.0",
+    "simulation": "standby",
+    "ai_agent": "ready",
+    "message": "🌱 Agri-Nexus Digital Twin is operational"
+})
+_ROOT_BODY = orjson.dumps({
+    "message": "Welcome to Agri-Nexus API",
+    "docs": "/api/docs",
+    "health": "/api/health"
+})
+
+_ENDPOINTS = (
+    "/api/health",
+    "/api/v1/test",
+    "/ws/sensors/{farm_id}",
+    "/api/research/full-scan"
+)
+
 
 # ============================================
 # Health Check Endpoint
@@ -71,16 +141,9 @@ async def health_check():
     Health check endpoint to verify API is running.
     
     Returns:
-        dict: Status information including version and simulation state
+        Response: Status information including version and simulation state
     """
-    return {
-        "status": "healthy",
-        "service": "agri-nexus-api",
-        "version": "1.0.0",
-        "simulation": "standby",
-        "ai_agent": "ready",
-        "message": "🌱 Agri-Nexus Digital Twin is operational"
-    }
+    return Response(_HEALTH_BODY, media_type="application/json")
 
 
 # ============================================
@@ -94,17 +157,11 @@ async def test_endpoint():
     Returns:
         dict: Test message with timestamp
     """
-    from datetime import datetime
     return {
         "success": True,
         "message": "Frontend-Backend connection established!",
-        "timestamp": datetime.now().isoformat(),
-        "endpoints_available": [
-            "/api/health",
-            "/api/v1/test",
-            "/ws/sensors/{farm_id}",
-            "/api/research/full-scan"
-        ]
+        "timestamp": datetime.now(),
+        "endpoints_available": _ENDPOINTS
     }
 
 
@@ -114,11 +171,11 @@ async def test_endpoint():
 @app.get("/", tags=["System"])
 async def root():
     """Redirect to API documentation."""
-    return {
-        "message": "Welcome to Agri-Nexus API",
-        "docs": "/api/docs",
-        "health": "/api/health"
-    }
+    return Response(
+        _ROOT_BODY,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=3600"}
+    )
 
 
 # Import and include routers
@@ -132,11 +189,29 @@ app.include_router(chat.router, prefix="/api", tags=["Chat"])
 
 
 if __name__ == "__main__":
+    import importlib.util
+    import os
     import uvicorn
+    
+    # uvloop is not available on Windows; fall back to the stdlib loop
+    # (and the pure-Python h11 parser if httptools is missing) there
+    has_uvloop = importlib.util.find_spec("uvloop") is not None
+    has_httptools = importlib.util.find_spec("httptools") is not None
+    
+    # Each worker process runs its own simulator, WebSocket connections and
+    # caches, so clients on different workers would see different farms.
+    # Keep the default at 1; raise WEB_CONCURRENCY (e.g. 2 * cores + 1) only
+    # for stateless HTTP traffic. Reload only works with a single process.
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
+        port=int(os.getenv("PORT", "8000")),
+        reload=workers == 1,
+        workers=workers,
+        log_level="info",
+        loop="uvloop" if has_uvloop else "asyncio",
+        http="httptools" if has_httptools else "h11",
+        ws="websockets"
     )
@@ -0,0 +1,42 @@
+"""
+Cache Helper Tests
+==================
+Tests for the in-process TTL cache.
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for the TTLCache class."""
+
+    def test_set_and_get(self):
+        """Test that stored values are returned."""
+        cache = TTLCache(maxsize=4, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+
+    def test_expired_entries_are_dropped(self):
+        """Test that entries are not returned after the TTL."""
+        cache = TTLCache(maxsize=4, ttl=-1)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted when full."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
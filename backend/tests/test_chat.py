@@ -0,0 +1,39 @@
+"""
+Chat Router Tests
+=================
+Tests for the chat response cache key.
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.routers.chat import ChatRequest, _response_cache_key
+from app.services.simulation_engine import get_simulator
+
+
+class TestResponseCacheKey:
+    """Tests for _response_cache_key."""
+
+    def test_prompt_thresholds_split_buckets(self):
+        """Test that readings in one bucket but across a prompt threshold get different keys."""
+        state = get_simulator().state
+        saved = (state.temperature, state.soil_moisture)
+        request = ChatRequest(message="Should I irrigate?")
+        try:
+            state.temperature, state.soil_moisture = 34.5, 50.0
+            mild = _response_cache_key(request)
+            state.temperature = 35.5
+            hot = _response_cache_key(request)
+            state.temperature = 34.1
+            assert _response_cache_key(request) == mild
+            assert hot != mild
+
+            state.soil_moisture = 39.5
+            dry = _response_cache_key(request)
+            state.soil_moisture = 40.5
+            assert _response_cache_key(request) != dry
+        finally:
+            state.temperature, state.soil_moisture = saved
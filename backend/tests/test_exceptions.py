@@ -0,0 +1,51 @@
+"""
+Exception Handler Tests
+=======================
+Tests for the JSON error responses.
+"""
+
+from decimal import Decimal
+import sys
+import os
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.exceptions import register_exception_handlers
+
+
+class Opaque:
+    """Object with no JSON representation."""
+
+    __slots__ = ()
+
+    def __str__(self):
+        return "opaque detail"
+
+
+app = FastAPI()
+register_exception_handlers(app)
+
+
+@app.get("/fail/{kind}")
+async def fail(kind: str):
+    details = {"text": "Not here", "set": {"a"}, "decimal": Decimal("1.5"), "opaque": Opaque()}
+    raise HTTPException(status_code=404, detail=details[kind])
+
+
+client = TestClient(app)
+
+
+class TestHttpExceptionHandler:
+    """Tests for http_exception_handler."""
+
+    def test_details_keep_their_status_code(self):
+        """Test that details orjson can't encode still produce the original 4xx."""
+        expected = {"text": "Not here", "set": ["a"], "decimal": 1.5, "opaque": "opaque detail"}
+        for kind, message in expected.items():
+            response = client.get(f"/fail/{kind}")
+            assert response.status_code == 404
+            assert response.json()["message"] == message
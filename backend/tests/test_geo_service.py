@@ -0,0 +1,116 @@
+"""
+Geo Service Tests
+=================
+Tests for reverse-geocoding lookups and their caching.
+"""
+
+import asyncio
+import sys
+import os
+
+import numpy as np
+from geopy.exc import GeocoderUnavailable
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.elevation import ElevationProvider
+from app.services import geo_service
+from app.services.geo_service import GeoService
+
+
+class FakeLocation:
+    """Minimal stand-in for a geopy Location."""
+
+    def __init__(self, address: dict):
+        self.raw = {"address": address}
+
+
+class FakeGeocoder:
+    """Async geocoder stand-in that counts reverse() calls.
+
+    Tests plug its reverse() in place of the rate-limited one.
+    """
+
+    def __init__(self, fail: bool = False, fail_first: int = 0):
+        self.fail = fail
+        self.fail_first = fail_first
+        self.calls = 0
+
+    async def reverse(self, query: str, language: str = "en"):
+        self.calls += 1
+        if self.fail or self.calls <= self.fail_first:
+            raise GeocoderUnavailable("offline")
+        return FakeLocation({"city": "Mysuru", "state": "Karnataka", "country": "India"})
+
+
+class TestGeoService:
+    """Tests for GeoService.lookup_location."""
+
+    def test_nearby_coordinates_share_one_lookup(self):
+        """Test that coordinates within the cache precision hit Nominatim once."""
+        service = GeoService()
+        geocoder = FakeGeocoder()
+        service._reverse = geocoder.reverse
+
+        first = asyncio.run(service.lookup_location(12.29521, 76.63921))
+        second = asyncio.run(service.lookup_location(12.29538, 76.63934))
+
+        assert geocoder.calls == 1
+        assert second is first
+        assert first.state == "Karnataka"
+
+    def test_failed_lookups_are_not_cached(self):
+        """Test that geocoder errors fall back without poisoning the cache."""
+        service = GeoService()
+        service._reverse = FakeGeocoder(fail=True).reverse
+
+        result = asyncio.run(service.lookup_location(12.3, 76.6))
+        assert result.terrain_type == "Unknown"
+
+        service._reverse = FakeGeocoder().reverse
+        result = asyncio.run(service.lookup_location(12.3, 76.6))
+        assert result.state == "Karnataka"
+
+    def test_failed_attempts_are_retried_within_budget(self, monkeypatch):
+        """Test that the rate limiter's retries run before the lookup times out."""
+        monkeypatch.setattr(geo_service, "GEOCODE_MIN_DELAY", 0.0)
+        monkeypatch.setattr(geo_service, "GEOCODE_ERROR_WAIT", 0.01)
+        service = GeoService()
+        geocoder = FakeGeocoder(fail_first=2)
+        service._set_geocoder(geocoder)
+
+        result = asyncio.run(service.lookup_location(12.3, 76.6))
+
+        assert geocoder.calls == 3
+        assert result.state == "Karnataka"
+
+    def test_lookup_many_deduplicates_coordinates(self):
+        """Test that batch lookups resolve each rounded coordinate once, in order."""
+        service = GeoService()
+        geocoder = FakeGeocoder()
+        service._reverse = geocoder.reverse
+
+        coords = [(12.3, 76.6), (12.30001, 76.60001), (15.4, 74.0), (12.3, 76.6)]
+        results = asyncio.run(service.lookup_locations_many(coords))
+
+        assert geocoder.calls == 2
+        assert len(results) == 4
+        assert results[0] is results[1] is results[3]
+
+
+class TestElevationProvider:
+    """Tests for SRTM tile lookups."""
+
+    def test_reads_nearest_sample_from_tile(self, tmp_path):
+        """Test that lookups index the tile north-up and skip void samples."""
+        # 3x3 tile: rows run north to south, columns west to east
+        grid = np.array([[900, 901, 902], [800, 801, -32768], [700, 701, 702]], dtype=">i2")
+        grid.tofile(tmp_path / "N12E076.hgt")
+        provider = ElevationProvider(str(tmp_path))
+
+        assert provider.elevation(12.99, 76.01) == 900.0
+        assert provider.elevation(12.01, 76.99) == 702.0
+        assert provider.elevation(12.5, 76.5) == 801.0
+        assert provider.elevation(12.5, 76.99) is None
+        assert provider.elevation(20.5, 76.5) is None
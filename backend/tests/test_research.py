@@ -0,0 +1,43 @@
+"""
+Research Router Tests
+=====================
+Tests for the full-scan response cache.
+"""
+
+from datetime import date, datetime
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.schemas import FullScanRequest, FullScanResponse
+from app.routers.research import _restamp_scan, _scan_cache_key
+from app.services.simulation_engine import WeatherSimulator
+
+
+class TestScanCache:
+    """Tests for full-scan cache keys and cache hits."""
+
+    def test_cache_hit_gets_live_readings_and_alerts(self):
+        """Test that a cached scan is served with the current readings, alerts and time."""
+        sim = WeatherSimulator(seed=1)
+        cached = FullScanResponse.model_construct(
+            weather_analysis={"current": {"soil_moisture": 50.0}, "current_alerts": [], "climate_zone": "Tropical"},
+            generated_at=datetime(2020, 1, 1)
+        )
+
+        sim.trigger_drought()
+        sim.update_state()
+        fresh = _restamp_scan(cached, sim)
+
+        assert fresh.weather_analysis["current"]["soil_moisture"] == sim.state.soil_moisture
+        assert any(alert["type"] == "CRITICAL_DRY" for alert in fresh.weather_analysis["current_alerts"])
+        assert fresh.weather_analysis["climate_zone"] == "Tropical"
+        assert fresh.generated_at > datetime(2020, 1, 1)
+        assert cached.weather_analysis["current_alerts"] == []
+
+    def test_cache_key_includes_day(self):
+        """Test that scans are keyed by day so daily market prices are not carried over."""
+        key = _scan_cache_key(FullScanRequest(lat=12.9, lon=77.6), WeatherSimulator().state)
+        assert key[-1] == date.today()
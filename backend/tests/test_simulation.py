@@ -12,7 +12,7 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.services.simulation_engine import WeatherSimulator, SimulationConfig
+from app.services.simulation_engine import WeatherSimulator, SimulationConfig, VectorWeatherSimulator
 
 
 class TestWeatherSimulator:
@@ -93,6 +93,34 @@ class TestWeatherSimulator:
             reading = sim.update_state()
             assert 0 <= reading.soil_moisture <= 100, f"Moisture out of bounds: {reading.soil_moisture}"
 
+    def test_update_state_batch_matches_single_ticks(self):
+        """Test that a batch advance reaches the same state as repeated update_state()."""
+        single = WeatherSimulator(seed=3)
+        batch = WeatherSimulator(seed=3)
+
+        readings = [single.update_state() for _ in range(100)]
+        final, trajectory = batch.update_state_batch(100)
+
+        assert trajectory.shape == (100, 3)
+        assert trajectory[:, 0].tolist() == [r.temperature for r in readings]
+        assert trajectory[:, 2].tolist() == [r.soil_moisture for r in readings]
+        assert final.model_dump(exclude={"timestamp"}) == readings[-1].model_dump(exclude={"timestamp"})
+        assert batch.get_sensor_snapshot() == single.get_sensor_snapshot()
+
+    def test_history_keeps_recent_ticks_in_order(self):
+        """Test that the history ring buffer wraps and returns the latest ticks oldest first."""
+        from app.services.simulation_engine import HISTORY_WINDOW, HISTORY_SOIL_MOISTURE
+
+        sim = WeatherSimulator(seed=5)
+        readings = [sim.update_state() for _ in range(HISTORY_WINDOW + 10)]
+
+        assert sim.get_history().shape == (3, HISTORY_WINDOW)
+        recent = sim.get_history(5)[HISTORY_SOIL_MOISTURE]
+        assert [round(float(value), 2) for value in recent] == [r.soil_moisture for r in readings[-5:]]
+
+        sim.reset()
+        assert sim.get_history().shape == (3, 0)
+
     def test_alerts_generated_on_low_moisture(self):
         """Test that alerts are generated when moisture is critically low."""
         sim = WeatherSimulator()
@@ -118,6 +146,35 @@ class TestWeatherSimulator:
         assert max(temps) - min(temps) > 5, "Temperature range too small for diurnal cycle"
 
 
+class TestVectorWeatherSimulator:
+    """Tests for the multi-field VectorWeatherSimulator."""
+
+    def test_readings_within_bounds(self):
+        """Test that every field stays within realistic bounds over many ticks."""
+        sim = VectorWeatherSimulator(n_fields=50, seed=7)
+
+        for _ in range(200):
+            sim.step()
+            assert ((sim.temperature > -10) & (sim.temperature < 50)).all()
+            assert ((sim.humidity >= 0) & (sim.humidity <= 100)).all()
+            assert ((sim.soil_moisture >= 0) & (sim.soil_moisture <= 100)).all()
+
+    def test_fields_evolve_independently(self):
+        """Test that fields get their own noise and rain, and readings are per field."""
+        sim = VectorWeatherSimulator(n_fields=20, seed=1)
+        # Rain already falling on the first half only
+        sim.is_raining[:10] = True
+        sim.rain_intensity[:10] = 0.8
+        sim.rain_ticks_remaining[:10] = 5
+        sim.step()
+
+        assert len(set(sim.temperature.tolist())) > 1
+        assert sim.is_raining[:10].all()
+        assert (sim.soil_moisture[:10] > 50).all()
+        assert sim.reading(3).is_raining is True
+        assert sim.reading(3).simulation_tick == 1
+
+
 class TestCropEngine:
     """Tests for the crop recommendation engine."""
 
@@ -139,6 +196,64 @@ class TestCropEngine:
         for i in range(len(recommendations) - 1):
             assert recommendations[i].feasibility_score >= recommendations[i + 1].feasibility_score
 
+    def test_vectorized_scores_match_scalar(self):
+        """Test that batch scoring agrees with calculate_feasibility per crop."""
+        from app.services.crop_engine import get_crop_engine, CROP_NAMES, CROP_DATABASE
+
+        engine = get_crop_engine()
+        for conditions in [(8, 30, 300, "Sandy"), (28, 70, 1500, "Loamy"), (40, 95, 4000, "Clay")]:
+            scores = engine.calculate_feasibility_batch(*conditions)
+            for i, name in enumerate(CROP_NAMES):
+                expected = engine.calculate_feasibility(CROP_DATABASE[name], *conditions)
+                assert scores[i] == expected, name
+
+    def test_batch_recommendations_match_single(self):
+        """Test that batch ranking picks the same crops and scores per location."""
+        from app.services.crop_engine import get_crop_engine, CROP_NAMES
+
+        engine = get_crop_engine()
+        conditions = [(8, 30, 300, "Sandy"), (28, 70, 1500, "Loamy"), (40, 95, 4000, "Clay"), (25, 80, 2200, "Loamy")]
+        temps, hums, rains, soils = zip(*conditions)
+        top_idx, top_scores = engine.get_recommendations_batch(temps, hums, rains, soils, top_n=5)
+
+        assert top_idx.shape == (4, 5)
+        for row, (temp, hum, rain, soil) in enumerate(conditions):
+            recs = engine.get_recommendations(temp, hum, rain, soil, top_n=5)
+            assert [CROP_NAMES[i] for i in top_idx[row]] == [r.crop_name for r in recs]
+            assert top_scores[row].tolist() == [r.feasibility_score for r in recs]
+
+    def test_recommendation_cache_stats_and_invalidate(self):
+        """Test that nearby queries share a cache entry and invalidate() empties it."""
+        from app.services.crop_engine import get_crop_engine
+
+        engine = get_crop_engine()
+        engine.invalidate()
+        first = engine.get_recommendations(27, 75, 1800, "Laterite", top_n=3)
+        # Within the 0.5°C / 1% / 10 mm buckets, so the same entry is reused
+        second = engine.get_recommendations(27.1, 75.3, 1802, "Laterite", top_n=3)
+
+        assert first == second
+        stats = engine.cache_stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+        engine.invalidate()
+        assert engine.cache_stats()["size"] == 0
+
+    def test_batch_recommendations_edge_inputs(self):
+        """Test that empty batches return empty arrays, scalars count as one location, and bad shapes fail."""
+        from app.services.crop_engine import get_crop_engine
+
+        engine = get_crop_engine()
+        top_idx, top_scores = engine.get_recommendations_batch([], [], [], [], top_n=5)
+        assert top_idx.shape == (0, 5)
+        assert top_scores.shape == (0, 5)
+
+        top_idx, _ = engine.get_recommendations_batch(28, 70, 1500, "Loamy", top_n=3)
+        assert top_idx.shape == (1, 3)
+
+        with pytest.raises(ValueError):
+            engine.get_recommendations_batch([28, 30], [70], [1500, 1200], ["Loamy", "Clay"])
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
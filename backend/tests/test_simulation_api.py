@@ -0,0 +1,69 @@
+"""
+Simulation API Tests
+====================
+Tests for the simulation control endpoints.
+"""
+
+import sys
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.routers import simulation
+from app.services.simulation_engine import HISTORY_WINDOW, get_simulator
+
+app = FastAPI()
+app.include_router(simulation.router, prefix="/api/sim")
+client = TestClient(app)
+
+
+class TestHistoryEndpoint:
+    """Tests for GET /api/sim/history."""
+
+    def test_returns_recent_columns(self):
+        """Test that the latest ticks come back as equal-length columns, oldest first."""
+        simulator = get_simulator()
+        simulator.reset()
+        readings = [simulator.update_state() for _ in range(5)]
+
+        response = client.get("/api/sim/history", params={"ticks": 3})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["end_tick"] == 5
+        assert body["soil_moisture"] == [r.soil_moisture for r in readings[-3:]]
+        assert len(body["temperature"]) == len(body["humidity"]) == 3
+
+    def test_rejects_out_of_range_ticks(self):
+        """Test that ticks outside 1..HISTORY_WINDOW fail validation."""
+        assert client.get("/api/sim/history", params={"ticks": 0}).status_code == 422
+        assert client.get("/api/sim/history", params={"ticks": HISTORY_WINDOW + 1}).status_code == 422
+
+
+class TestAdvanceEndpoint:
+    """Tests for POST /api/sim/advance."""
+
+    def test_advances_the_simulation(self):
+        """Test that the shared simulator moves forward by the requested ticks."""
+        simulator = get_simulator()
+        simulator.reset()
+
+        response = client.post("/api/sim/advance", params={"ticks": 12})
+
+        assert response.status_code == 200
+        assert simulator.state.tick_count == 12
+        assert response.json()["current_state"]["tick"] == 12
+        assert simulator.get_history().shape == (3, 12)
+
+    def test_rejects_out_of_range_ticks(self):
+        """Test that ticks outside 1..HISTORY_WINDOW fail validation without advancing."""
+        simulator = get_simulator()
+        simulator.reset()
+
+        assert client.post("/api/sim/advance", params={"ticks": 0}).status_code == 422
+        assert client.post("/api/sim/advance", params={"ticks": HISTORY_WINDOW + 1}).status_code == 422
+        assert simulator.state.tick_count == 0
@@ -0,0 +1,138 @@
+"""
+WebSocket Manager Tests
+=======================
+Tests for connection bookkeeping and broadcasting.
+"""
+
+import asyncio
+import json
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import socket_manager
+from app.core.socket_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """Minimal stand-in for a Starlette WebSocket."""
+
+    def __init__(self, fail: bool = False, stall: bool = False):
+        self.fail = fail
+        self.stall = stall
+        self.sent = []
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+    async def send_text(self, data: str):
+        if self.fail:
+            raise RuntimeError("client gone")
+        if self.stall:
+            await asyncio.sleep(3600)
+        self.sent.append(data)
+
+
+class TestConnectionManager:
+    """Tests for the ConnectionManager class."""
+
+    def test_broadcast_to_farm_sends_same_frame(self):
+        """Test that every farm subscriber receives the encoded message."""
+        manager = ConnectionManager()
+        clients = [FakeWebSocket(), FakeWebSocket()]
+
+        async def scenario():
+            for ws in clients:
+                await manager.connect(ws, "farm-1")
+            await manager.broadcast_to_farm({"value": 1}, "farm-1")
+
+        asyncio.run(scenario())
+
+        for ws in clients:
+            assert [json.loads(frame) for frame in ws.sent] == [{"value": 1}]
+
+    def test_broadcast_to_farm_drops_failed_clients(self):
+        """Test that clients whose send fails are disconnected."""
+        manager = ConnectionManager()
+        good, bad = FakeWebSocket(), FakeWebSocket(fail=True)
+
+        async def scenario():
+            await manager.connect(good, "farm-1")
+            await manager.connect(bad, "farm-1")
+            await manager.broadcast_to_farm({"value": 1}, "farm-1")
+
+        asyncio.run(scenario())
+
+        assert manager.get_connection_count("farm-1") == 1
+        assert manager.get_connection_count() == 1
+        assert len(good.sent) == 1
+
+    def test_broadcast_to_farm_drops_stalled_clients(self, monkeypatch):
+        """Test that a client that stops reading is dropped instead of blocking the broadcast."""
+        monkeypatch.setattr(socket_manager, "SEND_TIMEOUT", 0.01)
+        manager = ConnectionManager()
+        good, stalled = FakeWebSocket(), FakeWebSocket(stall=True)
+
+        async def scenario():
+            await manager.connect(good, "farm-1")
+            await manager.connect(stalled, "farm-1")
+            await manager.broadcast_to_farm({"value": 1}, "farm-1")
+
+        asyncio.run(scenario())
+
+        assert manager.get_connection_count("farm-1") == 1
+        assert len(good.sent) == 1
+        assert stalled.close_code == 1011
+        assert good.close_code is None
+
+    def test_stalled_client_socket_is_closed(self, monkeypatch):
+        """Test that a timed-out client is closed so its handler exits, not just untracked."""
+        monkeypatch.setattr(socket_manager, "SEND_TIMEOUT", 0.01)
+        manager = ConnectionManager()
+        stalled = FakeWebSocket(stall=True)
+
+        async def scenario():
+            await manager.connect(stalled, "farm-1")
+            await manager.broadcast_to_all({"value": 1})
+
+        asyncio.run(scenario())
+
+        assert stalled.close_code == 1011
+        assert manager.get_connection_count() == 0
+        assert manager.get_active_farms() == []
+
+    def test_broadcast_to_all_drops_failed_clients(self):
+        """Test that a failed global broadcast prunes the farm index too."""
+        manager = ConnectionManager()
+        good, bad = FakeWebSocket(), FakeWebSocket(fail=True)
+
+        async def scenario():
+            await manager.connect(good, "farm-1")
+            await manager.connect(bad, "farm-2")
+            await manager.broadcast_to_all({"value": 1})
+
+        asyncio.run(scenario())
+
+        assert manager.get_connection_count() == 1
+        assert manager.get_active_farms() == ["farm-1"]
+
+    def test_publish_to_farm_coalesces_updates(self):
+        """Test that rapid publishes collapse into one frame with the latest state."""
+        manager = ConnectionManager()
+        client = FakeWebSocket()
+
+        async def scenario():
+            await manager.connect(client, "farm-1")
+            for tick in range(5):
+                manager.publish_to_farm({"tick": tick}, "farm-1")
+            await manager._flush_task
+
+        asyncio.run(scenario())
+
+        assert [json.loads(frame) for frame in client.sent] == [{"tick": 4}]